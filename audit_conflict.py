@@ -46,6 +46,11 @@ def load_json(path):
     with open(path, 'r') as f:
         return json.load(f)
 
+def waypoint_columns_to_points(columns):
+    """Expand column-wise track waypoints ({'lat': [...], ...}) into per-point dicts."""
+    keys = list(columns)
+    return [dict(zip(keys, row)) for row in zip(*(columns[k] for k in keys))]
+
 def find_closest_point(points, lat, lon, alt=None):
     def dist(p):
         dlat = p['lat'] - lat
@@ -149,6 +154,8 @@ def audit_conflicts():
                 flight_data = next((fl for fl in anim.get('flights', []) if fl['flight_id'] == this_flight), None)
                 if flight_data:
                     points = flight_data.get('waypoints', [])
+                    if isinstance(points, dict):
+                        points = waypoint_columns_to_points(points)
                     if points:
                         p = find_closest_point(points, lat, lon, alt)
                         adiff = abs(p.get('altitude', 0) - alt)
@@ -78,4 +78,26 @@ DEPARTURE_TIME_STEP_MINUTES = 5
 
 # Transition altitude for feet/flight level display in pilot briefing
 # Altitudes below this are shown in feet, above in flight levels
-TRANSITION_ALTITUDE_FT = 10500 
\ No newline at end of file
+TRANSITION_ALTITUDE_FT = 10500 
+
+# =============================================================================
+# ANIMATION EXPORT PARAMETERS
+# =============================================================================
+
+# Optional map area for exported conflict points: (min_lat, max_lat, min_lon, max_lon)
+# Conflicts outside this box are left out of the animation files; None exports all
+# Example: (-39.0, -27.0, 140.0, 154.0) keeps only conflicts over south-east Australia
+ANIMATION_CONFLICT_BBOX = None
+
+# =============================================================================
+# XML EXTRACTION PARAMETERS
+# =============================================================================
+
+# Directory for cached flight plans parsed from SimBrief XML files
+# Entries are keyed by a hash of the XML content, so unchanged files skip parsing
+# on later runs; set to None to always parse the XML
+FLIGHTPLAN_CACHE_DIR = ".waypoint_cache"
+
+# Print every parsed waypoint and input file during extraction
+# Off by default: per-waypoint output dominates batch runs; a summary line is printed instead
+FLIGHTPLAN_VERBOSE = False
@@ -3,8 +3,8 @@
 SimBrief XML Flight Plan Extractor
 
 This script parses SimBrief XML flight plan files and extracts all waypoints, coordinates, 
-altitudes, and timing information for each flight. It supports both the main navlog and 
-alternate navlog sections.
+altitudes, and timing information for each flight from the main navlog; alternate navlog
+sections are skipped.
 
 FLIGHT ID SYSTEM:
 - Each flight is assigned a unique flight ID (FLT0001, FLT0002, etc.) during processing
@@ -25,17 +25,28 @@ import json
 import os
 import sys
 import argparse
-from typing import List, Dict, Optional, Tuple
+import contextlib
+import io
+import hashlib
+import zlib
+from dataclasses import asdict
+from typing import List, Dict, Optional, Tuple, Union, BinaryIO, Iterator
 from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
 from shared_types import FlightPlan, Waypoint
+from env import FLIGHTPLAN_CACHE_DIR, FLIGHTPLAN_VERBOSE
+
+# Bump when the parsing logic changes so stale cache entries are ignored
+FLIGHTPLAN_CACHE_VERSION = 2
+
+WAYPOINT_ABBREVIATIONS = {
+    "TOP OF CLIMB": "TOC",
+    "TOP OF DESCENT": "TOD"
+}
 
 def abbreviate_waypoint_name(name: str) -> str:
     """Abbreviate common waypoint names for cleaner display"""
-    abbreviations = {
-        "TOP OF CLIMB": "TOC",
-        "TOP OF DESCENT": "TOD"
-    }
-    return abbreviations.get(name, name)
+    return WAYPOINT_ABBREVIATIONS.get(name, name)
 
 def generate_flight_id(flight_counter: int) -> str:
     """
@@ -55,14 +66,23 @@ def generate_flight_id(flight_counter: int) -> str:
     """
     return f"FLT{flight_counter:04d}"
 
+def child_texts(element) -> Dict[str, str]:
+    """Map child tag to text in one scan; like findtext, the first child wins and empty text is ''"""
+    fields = {}
+    for child in element:
+        if child.tag not in fields:
+            fields[child.tag] = child.text or ''
+    return fields
+
 def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
     """Parse a waypoint from a fix element in the XML"""
     try:
         # Extract basic information
-        ident = fix_element.findtext('ident', '')
-        long_name = fix_element.findtext('name', ident)
-        waypoint_type = fix_element.findtext('type', '')
-        stage = fix_element.findtext('stage', '')
+        fields = child_texts(fix_element)
+        ident = fields.get('ident', '')
+        long_name = fields.get('name', ident)
+        waypoint_type = fields.get('type', '')
+        stage = fields.get('stage', '')
         
         # Use short name (ident) if available, otherwise use long name (with abbreviation)
         if ident and ident.strip():
@@ -71,8 +91,8 @@ def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
             name = abbreviate_waypoint_name(long_name)
         
         # Extract coordinates
-        lat_str = fix_element.findtext('pos_lat')
-        lon_str = fix_element.findtext('pos_long')
+        lat_str = fields.get('pos_lat')
+        lon_str = fields.get('pos_long')
         
         if not lat_str or not lon_str:
             return None
@@ -81,11 +101,11 @@ def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
         lon = float(lon_str)
         
         # Extract altitude
-        alt_str = fix_element.findtext('altitude_feet', '0')
+        alt_str = fields.get('altitude_feet', '0')
         altitude = int(float(alt_str))
         
         # Extract time (total time in seconds)
-        time_str = fix_element.findtext('time_total', '0')
+        time_str = fields.get('time_total', '0')
         time_total = int(float(time_str))
         
         return Waypoint(name, lat, lon, altitude, time_total, stage, waypoint_type)
@@ -97,11 +117,12 @@ def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
 def parse_airport_info(airport_element, is_arrival: bool = False) -> Optional[Waypoint]:
     """Parse airport information from origin/destination elements"""
     try:
-        icao = airport_element.findtext('icao_code', '')
-        long_name = airport_element.findtext('name', icao)
-        lat_str = airport_element.findtext('pos_lat')
-        lon_str = airport_element.findtext('pos_long')
-        elevation_str = airport_element.findtext('elevation', '0')
+        fields = child_texts(airport_element)
+        icao = fields.get('icao_code', '')
+        long_name = fields.get('name', icao)
+        lat_str = fields.get('pos_lat')
+        lon_str = fields.get('pos_long')
+        elevation_str = fields.get('elevation', '0')
         
         # Use ICAO code as name if available, otherwise use long name
         if icao and icao.strip():
@@ -125,24 +146,140 @@ def parse_airport_info(airport_element, is_arrival: bool = False) -> Optional[Wa
         print(f"Error parsing airport {icao}: {e}")
         return None
 
+def flight_plan_cache_path(xml_stream: BinaryIO) -> Optional[str]:
+    """Return the cache file for an open XML file, keyed by a hash of its content"""
+    if not FLIGHTPLAN_CACHE_DIR:
+        return None
+    digest = hashlib.sha1()
+    for chunk in iter(lambda: xml_stream.read(1 << 20), b''):
+        digest.update(chunk)
+    return os.path.join(FLIGHTPLAN_CACHE_DIR, f"v{FLIGHTPLAN_CACHE_VERSION}_{digest.hexdigest()}.json")
+
+def load_cached_flight_plan(cache_file: str, flight_id: str) -> Optional[FlightPlan]:
+    """Rebuild a flight plan from a cache entry, or return None if it is missing or unreadable"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        flight_plan = FlightPlan(cached['origin'], cached['destination'], cached['route'],
+                                 flight_id, cached['aircraft_type'])
+        if cached['departure']:
+            flight_plan.set_departure(Waypoint(**cached['departure']))
+        if cached['arrival']:
+            flight_plan.set_arrival(Waypoint(**cached['arrival']))
+        for waypoint in cached['waypoints']:
+            flight_plan.add_waypoint(Waypoint(**waypoint))
+        return flight_plan
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Warning: Ignoring unreadable cache entry {cache_file}: {e}")
+        return None
+
+def save_cached_flight_plan(cache_file: str, flight_plan: FlightPlan):
+    """Store the parsed flight plan (without its per-run flight ID) as a cache entry"""
+    cached = {
+        'origin': flight_plan.origin,
+        'destination': flight_plan.destination,
+        'route': flight_plan.route,
+        'aircraft_type': flight_plan.aircraft_type,
+        'departure': asdict(flight_plan.departure) if flight_plan.departure else None,
+        'arrival': asdict(flight_plan.arrival) if flight_plan.arrival else None,
+        'waypoints': [asdict(wp) for wp in flight_plan.waypoints]
+    }
+    try:
+        os.makedirs(FLIGHTPLAN_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so an interrupted run never leaves a partial entry
+        tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(cached, separators=(',', ':'), ensure_ascii=False))
+        os.replace(tmp_file, cache_file)
+    except OSError as e:
+        print(f"Warning: Could not write cache entry {cache_file}: {e}")
+
 def extract_flight_plan_from_xml(xml_file: str, flight_id: str = "") -> Optional[FlightPlan]:
-    """Extract flight plan from SimBrief XML file"""
+    """Extract flight plan from SimBrief XML file, reusing a cached parse when the file is unchanged"""
+    # One binary handle serves both the cache key hash and the parser (expat wants bytes)
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-        
-        # Extract basic flight information
-        origin_elem = root.find('origin')
-        dest_elem = root.find('destination')
-        route_elem = root.find('.//route')
+        with open(xml_file, 'rb') as xml_stream:
+            cache_file = flight_plan_cache_path(xml_stream)
+            if cache_file:
+                flight_plan = load_cached_flight_plan(cache_file, flight_id)
+                if flight_plan:
+                    print(f"Loaded cached flight plan for {os.path.basename(xml_file)} "
+                          f"({len(flight_plan.waypoints)} navlog waypoints)")
+                    return flight_plan
+                xml_stream.seek(0)
+            flight_plan = parse_flight_plan_xml(xml_stream, flight_id)
+    except OSError as e:
+        print(f"Error reading XML file: {e}")
+        return None
+    
+    if flight_plan and cache_file:
+        save_cached_flight_plan(cache_file, flight_plan)
+    return flight_plan
+
+def parse_flight_plan_xml(xml_file: Union[str, BinaryIO], flight_id: str = "") -> Optional[FlightPlan]:
+    """Parse flight plan from a SimBrief XML file path or open binary file"""
+    try:
+        # Single streaming pass over the OFP. Top-level sections that are not needed
+        # are cleared and detached as soon as they close, and navlog fixes are parsed,
+        # cleared and detached one at a time, so memory stays flat however long the
+        # navlog is and the full document tree is never held in memory.
+        origin_elem = None
+        dest_elem = None
+        aircraft_elem = None
+        general_route_text = None  # <general><route>, where SimBrief puts the route
+        route_text = None  # First <route> anywhere, used if there is no general/route
+        navlog_found = False
+        navlog_elem = None  # The first navlog while it is open
+        root = None
+        navlog_waypoints = []
+        depth = 0  # Depth of the current element; the root element is depth 1
+        section = None  # Tag of the open top-level section
+        for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = elem
+                elif depth == 2:
+                    section = elem.tag
+                    if section == 'navlog' and not navlog_found:
+                        navlog_found = True
+                        navlog_elem = elem
+                continue
+            
+            tag = elem.tag
+            if tag == 'route':
+                if depth == 3 and section == 'general' and general_route_text is None:
+                    general_route_text = elem.text or ""
+                if route_text is None:
+                    route_text = elem.text or ""
+            if depth == 3 and navlog_elem is not None and tag == 'fix':
+                waypoint = parse_waypoint_from_fix(elem)
+                if waypoint:
+                    navlog_waypoints.append(waypoint)
+                elem.clear()
+                navlog_elem.remove(elem)
+            elif depth == 2:
+                if tag == 'origin' and origin_elem is None:
+                    origin_elem = elem
+                elif tag == 'destination' and dest_elem is None:
+                    dest_elem = elem
+                elif tag == 'aircraft' and aircraft_elem is None:
+                    aircraft_elem = elem
+                else:
+                    if elem is navlog_elem:
+                        navlog_elem = None
+                    elem.clear()
+                    root.remove(elem)
+            depth -= 1
         
         origin_code = origin_elem.findtext('icao_code', '') if origin_elem else 'UNKNOWN'
         dest_code = dest_elem.findtext('icao_code', '') if dest_elem else 'UNKNOWN'
-        route = route_elem.text if (route_elem is not None and route_elem.text is not None) else ""
+        route = general_route_text if general_route_text is not None else (route_text or "")
         
         # Extract aircraft type from XML
         aircraft_type = "UNK"  # Default fallback
-        aircraft_elem = root.find('aircraft')
         if aircraft_elem is not None:
             # Try to get ICAO aircraft code
             icao_code = aircraft_elem.findtext('icaocode')
@@ -170,15 +307,15 @@ def extract_flight_plan_from_xml(xml_file: str, flight_id: str = "") -> Optional
                 flight_plan.set_arrival(arrival)
                 print(f"Arrival: {arrival}")
         
-        # Parse main navlog waypoints
-        navlog = root.find('navlog')
-        if navlog is not None:
+        # Add main navlog waypoints (parsed during the scan above)
+        if navlog_found:
             print(f"\nParsing main navlog waypoints...")
-            for fix in navlog.findall('fix'):
-                waypoint = parse_waypoint_from_fix(fix)
-                if waypoint:
-                    flight_plan.add_waypoint(waypoint)
+            for waypoint in navlog_waypoints:
+                flight_plan.add_waypoint(waypoint)
+                if FLIGHTPLAN_VERBOSE:
                     print(f"  - {waypoint}")
+            if not FLIGHTPLAN_VERBOSE:
+                print(f"  parsed {len(navlog_waypoints)} waypoints")
         
         # Set correct arrival time based on the last waypoint
         if flight_plan.arrival and flight_plan.waypoints:
@@ -195,65 +332,88 @@ def extract_flight_plan_from_xml(xml_file: str, flight_id: str = "") -> Optional
         print(f"Error parsing XML file: {e}")
         return None
 
-def create_kml_from_flight_plan(flight_plan: FlightPlan, filename: str) -> str:
-    """Create KML content from flight plan"""
+# Diverse colors for different routes (in KML format: AABBGGRR)
+_ROUTE_COLORS = (
+    "ff0000ff",  # Red
+    "ff00ff00",  # Green  
+    "ffff0000",  # Blue
+    "ffff00ff",  # Magenta
+    "ff00ffff",  # Cyan
+    "ffffff00",  # Yellow
+    "ff8000ff",  # Orange
+    "ff0080ff",  # Purple
+    "ff800080",  # Dark Purple
+    "ff008080",  # Teal
+    "ffff8000",  # Light Blue
+    "ff8000ff",  # Pink
+    "ff00ff80",  # Lime Green
+    "ffff0080",  # Light Red
+    "ff800080",  # Dark Blue
+    "ffff4000",  # Light Orange
+    "ff4000ff",  # Light Purple
+    "ff00ff40",  # Bright Green
+    "ffff0040",  # Bright Red
+    "ff400080",  # Dark Pink
+    "ffff6000",  # Orange Red
+    "ff6000ff",  # Purple Pink
+    "ff00ff60",  # Bright Lime
+    "ffff0060",  # Bright Pink
+    "ff600080",  # Dark Magenta
+    "ffff2000",  # Light Yellow
+    "ff2000ff",  # Light Blue
+    "ff00ff20",  # Pale Green
+    "ffff0020",  # Pale Red
+    "ff200080",  # Pale Purple
+    "ffffa000",  # Gold
+    "ffa000ff",  # Lavender
+    "ff00ffa0",  # Mint Green
+    "ffff00a0",  # Salmon
+    "ffa00080",  # Plum
+    "ffffc000",  # Amber
+    "ffc000ff",  # Violet
+    "ff00ffc0",  # Aqua
+    "ffff00c0",  # Rose
+    "ffc00080",  # Orchid
+    "ffffe000",  # Light Gold
+    "ffe000ff",  # Light Lavender
+    "ff00ffe0",  # Light Mint
+    "ffff00e0",  # Light Salmon
+    "ffe00080",  # Light Plum
+)
+
+# KML marker for a single waypoint, filled in with str.format
+_WAYPOINT_PLACEMARK_TEMPLATE = '''    <Placemark>
+      <name>{name}</name>
+      <description>
+        <![CDATA[
+        <h3>{name}</h3>
+        <p><strong>Coordinates:</strong> {lat:.6f}, {lon:.6f}</p>
+        <p><strong>Altitude:</strong> {altitude} ft</p>
+        <p><strong>Time:</strong> {time}</p>
+        <p><strong>Stage:</strong> {stage}</p>
+        <p><strong>Type:</strong> {waypoint_type}</p>
+        ]]>
+      </description>
+      <Style>
+        <LabelStyle>
+          <color>{color}</color>
+          <scale>{scale}</scale>
+        </LabelStyle>
+      </Style>
+    </Placemark>
+'''
+
+def iter_kml_chunks(flight_plan: FlightPlan) -> Iterator[str]:
+    """Yield KML content for a flight plan in document order"""
     all_waypoints = flight_plan.get_all_waypoints()
     
-    # Define 40 diverse colors for different routes (in KML format: AABBGGRR)
-    route_colors = [
-        "ff0000ff",  # Red
-        "ff00ff00",  # Green  
-        "ffff0000",  # Blue
-        "ffff00ff",  # Magenta
-        "ff00ffff",  # Cyan
-        "ffffff00",  # Yellow
-        "ff8000ff",  # Orange
-        "ff0080ff",  # Purple
-        "ff800080",  # Dark Purple
-        "ff008080",  # Teal
-        "ffff8000",  # Light Blue
-        "ff8000ff",  # Pink
-        "ff00ff80",  # Lime Green
-        "ffff0080",  # Light Red
-        "ff800080",  # Dark Blue
-        "ffff4000",  # Light Orange
-        "ff4000ff",  # Light Purple
-        "ff00ff40",  # Bright Green
-        "ffff0040",  # Bright Red
-        "ff400080",  # Dark Pink
-        "ffff6000",  # Orange Red
-        "ff6000ff",  # Purple Pink
-        "ff00ff60",  # Bright Lime
-        "ffff0060",  # Bright Pink
-        "ff600080",  # Dark Magenta
-        "ffff2000",  # Light Yellow
-        "ff2000ff",  # Light Blue
-        "ff00ff20",  # Pale Green
-        "ffff0020",  # Pale Red
-        "ff200080",  # Pale Purple
-        "ffffa000",  # Gold
-        "ffa000ff",  # Lavender
-        "ff00ffa0",  # Mint Green
-        "ffff00a0",  # Salmon
-        "ffa00080",  # Plum
-        "ffffc000",  # Amber
-        "ffc000ff",  # Violet
-        "ff00ffc0",  # Aqua
-        "ffff00c0",  # Rose
-        "ffc00080",  # Orchid
-        "ffffe000",  # Light Gold
-        "ffe000ff",  # Light Lavender
-        "ff00ffe0",  # Light Mint
-        "ffff00e0",  # Light Salmon
-        "ffe00080",  # Light Plum
-    ]
-    
     # Get color based on route (use origin-destination as key)
+    # crc32 is stable across runs, unlike hash() which is salted per interpreter
     route_key = f"{flight_plan.origin}-{flight_plan.destination}"
-    color_index = hash(route_key) % len(route_colors)
-    route_color = route_colors[color_index]
+    color_index = zlib.crc32(route_key.encode('utf-8')) % len(_ROUTE_COLORS)
+    route_color = _ROUTE_COLORS[color_index]
     
-    kml_template = f'''<?xml version="1.0" encoding="UTF-8"?>
+    yield f'''<?xml version="1.0" encoding="UTF-8"?>
 <kml xmlns="http://www.opengis.net/kml/2.2">
   <Document>
     <name>{flight_plan.flight_id} Flight Plan - {flight_plan.origin} to {flight_plan.destination}</name>
@@ -292,69 +452,58 @@ def create_kml_from_flight_plan(flight_plan: FlightPlan, filename: str) -> str:
         <coordinates>
 '''
     
-    # Add coordinates
-    for waypoint in all_waypoints:
-        kml_template += f"          {waypoint.lon},{waypoint.lat},{waypoint.altitude}\n"
+    # Coordinates are rendered as one block, waypoint markers one chunk each
+    yield ''.join(f"          {waypoint.lon},{waypoint.lat},{waypoint.altitude}\n"
+                  for waypoint in all_waypoints)
     
-    kml_template += '''        </coordinates>
+    yield '''        </coordinates>
       </LineString>
     </Placemark>
     
     <!-- Waypoints -->
 '''
     
-    # Add waypoint markers with matching route color
+    # Add waypoint markers with matching route color; departure/arrival labels are larger
+    last_index = len(all_waypoints) - 1
+    format_placemark = _WAYPOINT_PLACEMARK_TEMPLATE.format
     for i, waypoint in enumerate(all_waypoints):
-        # Use route color for all waypoints in this flight plan
-        waypoint_color = route_color
-        scale = "1.5" if i == 0 or i == len(all_waypoints)-1 else "1.0"  # Larger for departure/arrival
-        
-        kml_template += f'''    <Placemark>
-      <name>{waypoint.name}</name>
-      <description>
-        <![CDATA[
-        <h3>{waypoint.name}</h3>
-        <p><strong>Coordinates:</strong> {waypoint.lat:.6f}, {waypoint.lon:.6f}</p>
-        <p><strong>Altitude:</strong> {waypoint.altitude} ft</p>
-        <p><strong>Time:</strong> {waypoint.get_time_formatted_simbrief()}</p>
-        <p><strong>Stage:</strong> {waypoint.stage}</p>
-        <p><strong>Type:</strong> {waypoint.waypoint_type}</p>
-        ]]>
-      </description>
-      <Style>
-        <LabelStyle>
-          <color>{waypoint_color}</color>
-          <scale>{scale}</scale>
-        </LabelStyle>
-      </Style>
-    </Placemark>
-'''
+        yield format_placemark(
+            name=waypoint.name,
+            lat=waypoint.lat,
+            lon=waypoint.lon,
+            altitude=waypoint.altitude,
+            time=waypoint.get_time_formatted_simbrief(),
+            stage=waypoint.stage,
+            waypoint_type=waypoint.waypoint_type,
+            color=route_color,
+            scale="1.5" if i == 0 or i == last_index else "1.0"
+        )
     
-    kml_template += '''  </Document>
+    yield '''  </Document>
 </kml>'''
-    
-    return kml_template
+
+def create_kml_from_flight_plan(flight_plan: FlightPlan, filename: str) -> str:
+    """Create KML content from flight plan"""
+    # Join once at the end; repeated += would copy the whole document per waypoint
+    return ''.join(iter_kml_chunks(flight_plan))
 
 def save_flight_data(flight_plan: FlightPlan, base_filename: str):
-    """Save flight plan data to JSON and KML files in temp directory"""
-    
-    # Create temp directory if it doesn't exist
+    """Save flight plan data to JSON and KML files in temp directory (created by main)"""
     temp_dir = "temp"
-    if not os.path.exists(temp_dir):
-        os.makedirs(temp_dir)
-        print(f"Created temp directory: {temp_dir}")
     
     # Save as JSON in temp directory
     json_filename = os.path.join(temp_dir, f"{base_filename}_data.json")
-    with open(json_filename, 'w', encoding='utf-8') as f:
-        json.dump(flight_plan.to_dict(), f, indent=2, ensure_ascii=False)
+    # Encode in one json.dumps call and write once; json.dump streams many small writes
+    json_content = json.dumps(flight_plan.to_dict(), indent=2, ensure_ascii=False)
+    with open(json_filename, 'wb') as f:
+        f.write(json_content.encode('utf-8'))
     print(f"Saved flight data to {json_filename}")
     
     # Save as KML in temp directory
     kml_filename = os.path.join(temp_dir, f"{base_filename}.kml")
-    kml_content = create_kml_from_flight_plan(flight_plan, base_filename)
-    with open(kml_filename, 'w', encoding='utf-8') as f:
-        f.write(kml_content)
+    # Stream the chunks as bytes so the whole document is never held in memory
+    with open(kml_filename, 'wb') as f:
+        f.writelines(chunk.encode('utf-8') for chunk in iter_kml_chunks(flight_plan))
     print(f"Saved KML to {kml_filename}")
     
     # Print summary
@@ -366,11 +515,18 @@ def save_flight_data(flight_plan: FlightPlan, base_filename: str):
     print(f"   Total waypoints: {len(all_waypoints)}")
     print(f"   Route: {flight_plan.route}")
     
-    if all_waypoints:
+    if all_waypoints and FLIGHTPLAN_VERBOSE:
         print(f"\nWaypoints:")
         for i, wp in enumerate(all_waypoints):
             print(f"   {i+1:2d}. {wp.name:12s} {wp.lat:8.4f}, {wp.lon:8.4f} {wp.altitude:6d}ft {wp.get_time_formatted_simbrief()} (elapsed)")
 
+def extract_flight_plan_with_log(xml_path: str) -> Tuple[Optional[FlightPlan], str]:
+    """Extract a flight plan without a flight ID, returning it with the captured parser output"""
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        flight_plan = extract_flight_plan_from_xml(xml_path)
+    return flight_plan, log.getvalue()
+
 def main():
     """Main function to process SimBrief XML files"""
     parser = argparse.ArgumentParser(description='Extract flight plans from SimBrief XML files')
@@ -387,20 +543,23 @@ def main():
             import shutil
             try:
                 # Delete contents but keep the directory
-                for item in os.listdir(temp_dir):
-                    item_path = os.path.join(temp_dir, item)
-                    try:
-                        if os.path.isfile(item_path):
-                            os.remove(item_path)
-                        elif os.path.isdir(item_path):
-                            shutil.rmtree(item_path)
-                    except OSError as e:
-                        print(f"Warning: Could not delete {item}: {e}")
+                # scandir entries carry their file type, so no extra stat per item
+                with os.scandir(temp_dir) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                os.remove(entry.path)
+                            elif entry.is_dir():
+                                shutil.rmtree(entry.path)
+                        except OSError as e:
+                            print(f"Warning: Could not delete {entry.name}: {e}")
                         # Continue with other files
                 print("Cleared existing temp directory contents")
             except OSError as e:
                 print(f"Warning: Could not clear temp directory contents: {e}")
                 # Continue anyway, the directory will be recreated if needed
+        # Create the output directory once rather than checking it for every flight
+        os.makedirs(temp_dir, exist_ok=True)
         
         # Determine which files to process
         if args.files:
@@ -417,58 +576,55 @@ def main():
                 exit(1)
                 
             print(f"Processing {len(xml_files)} specified XML files:")
-            for xml_file in xml_files:
-                print(f"   - {xml_file}")
+            if FLIGHTPLAN_VERBOSE:
+                for xml_file in xml_files:
+                    print(f"   - {xml_file}")
         else:
             # Process all XML files in xml_files directory (backward compatibility)
             xml_dir = "xml_files"
             if not os.path.exists(xml_dir):
                 print(f"XML directory {xml_dir} not found")
                 exit(1)
-            xml_files = [os.path.join(xml_dir, f) for f in os.listdir(xml_dir) if f.endswith('.xml')]
+            with os.scandir(xml_dir) as entries:
+                xml_files = [entry.path for entry in entries if entry.name.endswith('.xml') and entry.is_file()]
             if not xml_files:
                 print(f"No XML files found in the {xml_dir} directory")
                 exit(1)
             print(f"Processing all {len(xml_files)} XML files in {xml_dir}:")
-            for xml_file in xml_files:
-                print(f"   - {os.path.basename(xml_file)}")
+            if FLIGHTPLAN_VERBOSE:
+                for xml_file in xml_files:
+                    print(f"   - {os.path.basename(xml_file)}")
         
         print("\n" + "=" * 50)
         
-        # Track flights with same origin-destination to generate unique IDs
-        route_counter = {}  # Track count for each origin-destination pair
         flight_counter = 1  # Global flight counter for unique IDs
         
+        # Files are independent, so parse them in worker processes; results come back
+        # in input order and each file's parser output is printed with its own section
+        workers = min(len(xml_files), os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                extracted = list(executor.map(extract_flight_plan_with_log, xml_files))
+        else:
+            extracted = [extract_flight_plan_with_log(xml_path) for xml_path in xml_files]
+        
         success_count = 0
-        for xml_path in xml_files:
+        for xml_path, (flight_plan, extract_log) in zip(xml_files, extracted):
             xml_filename = os.path.basename(xml_path)
             print(f"Processing {xml_filename}...")
             print("----------------------------------------")
+            print(extract_log, end='')
             
-            # Extract basic info first to determine flight ID
-            try:
-                tree = ET.parse(xml_path)
-                root = tree.getroot()
-                origin_elem = root.find('origin')
-                dest_elem = root.find('destination')
-                origin_code = origin_elem.findtext('icao_code', '') if origin_elem else 'UNKNOWN'
-                dest_code = dest_elem.findtext('icao_code', '') if dest_elem else 'UNKNOWN'
-                route_key = f"{origin_code}-{dest_code}"
-                
-                # Generate unique flight ID
-                flight_id = generate_flight_id(flight_counter)
-                flight_counter += 1
-                
-                print(f"Flight ID: {flight_id} for route {route_key}")
-                
-            except Exception as e:
-                print(f"Error reading basic flight info from {xml_filename}: {e}")
-                continue
-            
-            flight_plan = extract_flight_plan_from_xml(xml_path, flight_id)
             if not flight_plan:
                 print(f"Failed to extract flight plan from {xml_filename}")
                 continue
+            # Generate unique flight ID; the counter only advances for files that parse
+            flight_id = generate_flight_id(flight_counter)
+            flight_plan.flight_id = flight_id
+            flight_counter += 1
+            
+            route_key = f"{flight_plan.origin}-{flight_plan.destination}"
+            print(f"Flight ID: {flight_id} for route {route_key}")
             
             # Use flight ID as base filename instead of XML filename
             base_filename = flight_id
@@ -34,6 +34,8 @@ import os
 import json
 import math
 import logging
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Tuple, Optional, Any
 from collections import defaultdict
 from dataclasses import dataclass
@@ -80,6 +82,42 @@ def parse_no_conflict_zones() -> Dict[str, float]:
             print(f"Warning: Invalid zone format: {zone}")
     return zones
 
+def build_no_conflict_zone_table() -> List[Tuple[float, float, float, float]]:
+    """
+    Precompute the haversine terms of each no-conflict zone airport.
+    
+    Returns:
+        List of (max_distance, lat_rad, lon_rad, cos_lat) rows for the zones
+        whose airport is in AIRPORT_COORDINATES
+    """
+    table = []
+    for airport_code, max_distance in parse_no_conflict_zones().items():
+        if airport_code in AIRPORT_COORDINATES:
+            airport_lat_rad = math.radians(AIRPORT_COORDINATES[airport_code]["lat"])
+            airport_lon_rad = math.radians(AIRPORT_COORDINATES[airport_code]["lon"])
+            table.append((max_distance, airport_lat_rad, airport_lon_rad, math.cos(airport_lat_rad)))
+    return table
+
+NO_CONFLICT_ZONE_TABLE = build_no_conflict_zone_table()
+
+def in_no_conflict_zone(lat: float, lon: float) -> bool:
+    """
+    Check whether a point lies within any no-conflict zone around an airport.
+    
+    Uses the same haversine as calculate_distance_nm, with the airport-side
+    radians and cosine taken from NO_CONFLICT_ZONE_TABLE.
+    """
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    cos_lat = math.cos(lat_rad)
+    for max_distance, airport_lat_rad, airport_lon_rad, airport_cos_lat in NO_CONFLICT_ZONE_TABLE:
+        dlat = airport_lat_rad - lat_rad
+        dlon = airport_lon_rad - lon_rad
+        a = math.sin(dlat/2)**2 + cos_lat * airport_cos_lat * math.sin(dlon/2)**2
+        if EARTH_RADIUS_NM * (2 * math.atan2(math.sqrt(a), math.sqrt(1-a))) < max_distance:
+            return True
+    return False
+
 # =============================================================================
 # ATC Conflict Detection Script
 #
@@ -103,7 +141,7 @@ EARTH_RADIUS_NM = 3440.065
 # DATA MODELS - Moved to shared_types.py
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class Conflict:
     """
     Represents a detected conflict between two aircraft.
@@ -112,6 +150,9 @@ class Conflict:
     - flight1 and flight2 contain flight IDs (FLT0001, FLT0002, etc.)
     - Enables tracking of "first conflicts" between unique aircraft pairs
     - Route information is preserved for separation rule enforcement
+    
+    Conflicts travel between scripts as JSON dicts; the report converts them
+    to slotted records once so the formatting loop uses attribute access.
     """
     flight1: str  # Flight ID of first aircraft (FLT0001, FLT0002, etc.)
     flight2: str  # Flight ID of second aircraft (FLT0001, FLT0002, etc.)
@@ -135,6 +176,15 @@ class Conflict:
     flight1_arrival: Optional[float] = None
     flight2_arrival: Optional[float] = None
     time_diff: Optional[float] = None
+    flight1_idx: int = -1
+    flight2_idx: int = -1
+    conflict_type: str = "enroute"
+    time: float = 0.0
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Conflict":
+        """Build a Conflict from a conflict dict, ignoring unknown keys."""
+        return cls(**{key: value for key, value in data.items() if key in cls.__dataclass_fields__})
 
 # =============================================================================
 # UTILITY FUNCTIONS
@@ -182,6 +232,10 @@ def calculate_distance_nm(lat1: float, lon1: float, lat2: float, lon2: float) ->
     
     return EARTH_RADIUS_NM * c
 
+# 8-point compass names and the bearings where each sector after the first starts
+COMPASS_DIRECTIONS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+COMPASS_SECTOR_BOUNDS = (22.5, 67.5, 112.5, 157.5, 202.5, 247.5, 292.5, 337.5)
+
 def get_compass_direction(lat1: float, lon1: float, lat2: float, lon2: float) -> str:
     """
     Get compass direction from point 1 to point 2.
@@ -200,31 +254,17 @@ def get_compass_direction(lat1: float, lon1: float, lat2: float, lon2: float) ->
     if bearing < 0:
         bearing += 360
     
-    # Convert to 8-point compass
-    if 337.5 <= bearing or bearing < 22.5:
-        return "N"
-    elif 22.5 <= bearing < 67.5:
-        return "NE"
-    elif 67.5 <= bearing < 112.5:
-        return "E"
-    elif 112.5 <= bearing < 157.5:
-        return "SE"
-    elif 157.5 <= bearing < 202.5:
-        return "S"
-    elif 202.5 <= bearing < 247.5:
-        return "SW"
-    elif 247.5 <= bearing < 292.5:
-        return "W"
-    else:  # 292.5 <= bearing < 337.5
-        return "NW"
+    # Convert to 8-point compass; sectors are centred on each direction
+    return COMPASS_DIRECTIONS[bisect_right(COMPASS_SECTOR_BOUNDS, bearing) % 8]
+
+WAYPOINT_ABBREVIATIONS = {
+    "TOP OF CLIMB": "TOC",
+    "TOP OF DESCENT": "TOD"
+}
 
 def abbreviate_waypoint_name(name: str) -> str:
     """Abbreviate common waypoint names for cleaner display."""
-    abbreviations = {
-        "TOP OF CLIMB": "TOC",
-        "TOP OF DESCENT": "TOD"
-    }
-    return abbreviations.get(name, name)
+    return WAYPOINT_ABBREVIATIONS.get(name, name)
 
 def minutes_to_utc_hhmm(minutes: float) -> str:
     """Convert minutes since midnight UTC to zero-padded 4-digit HHMM string."""
@@ -237,6 +277,14 @@ def minutes_to_utc_hhmm(minutes: float) -> str:
 # XML PARSING FUNCTIONS
 # =============================================================================
 
+def child_texts(element) -> Dict[str, str]:
+    """Map child tag to text in one scan; like findtext, the first child wins and empty text is ''"""
+    fields = {}
+    for child in element:
+        if child.tag not in fields:
+            fields[child.tag] = child.text or ''
+    return fields
+
 def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
     """
     Parse a waypoint from a fix element in the XML.
@@ -249,10 +297,11 @@ def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
     """
     try:
         # Extract basic information
-        ident = fix_element.findtext('ident', '')
-        long_name = fix_element.findtext('name', ident)
-        waypoint_type = fix_element.findtext('type', '')
-        stage = fix_element.findtext('stage', '')
+        fields = child_texts(fix_element)
+        ident = fields.get('ident', '')
+        long_name = fields.get('name', ident)
+        waypoint_type = fields.get('type', '')
+        stage = fields.get('stage', '')
         
         # Use short name (ident) if available, otherwise use long name
         if ident and ident.strip():
@@ -261,8 +310,8 @@ def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
             name = abbreviate_waypoint_name(long_name)
         
         # Extract coordinates
-        lat_str = fix_element.findtext('pos_lat')
-        lon_str = fix_element.findtext('pos_long')
+        lat_str = fields.get('pos_lat')
+        lon_str = fields.get('pos_long')
         
         if not lat_str or not lon_str:
             logging.warning(f"Missing coordinates for waypoint {name}")
@@ -272,11 +321,11 @@ def parse_waypoint_from_fix(fix_element) -> Optional[Waypoint]:
         lon = float(lon_str)
         
         # Extract altitude
-        alt_str = fix_element.findtext('altitude_feet', '0')
+        alt_str = fields.get('altitude_feet', '0')
         altitude = int(float(alt_str))
         
         # Extract time (total time in seconds)
-        time_str = fix_element.findtext('time_total', '0')
+        time_str = fields.get('time_total', '0')
         time_total = int(float(time_str))
         
         return Waypoint(name, lat, lon, altitude, time_total, stage, waypoint_type)
@@ -296,11 +345,12 @@ def parse_airport_info(airport_element) -> Optional[Waypoint]:
         Waypoint object representing the airport or None if parsing fails
     """
     try:
-        icao = airport_element.findtext('icao_code', '')
-        long_name = airport_element.findtext('name', icao)
-        lat_str = airport_element.findtext('pos_lat')
-        lon_str = airport_element.findtext('pos_long')
-        elevation_str = airport_element.findtext('elevation', '0')
+        fields = child_texts(airport_element)
+        icao = fields.get('icao_code', '')
+        long_name = fields.get('name', icao)
+        lat_str = fields.get('pos_lat')
+        lon_str = fields.get('pos_long')
+        elevation_str = fields.get('elevation', '0')
         
         # Use ICAO code as name if available, otherwise use long name
         if icao and icao.strip():
@@ -334,17 +384,51 @@ def extract_flight_plan_from_xml(xml_file: str, flight_id: str = "") -> Optional
         FlightPlan object or None if extraction fails
     """
     try:
-        tree = ET.parse(xml_file)
-        root = tree.getroot()
-        
-        # Extract basic flight information
-        origin_elem = root.find('origin')
-        dest_elem = root.find('destination')
-        route_elem = root.find('.//route')
+        # Stream the document: origin/destination are kept, navlog fixes are parsed and
+        # dropped as they close, and every other top-level section is discarded
+        origin_elem = None
+        dest_elem = None
+        route_elem = None  # First <route> in document order
+        route = ""
+        navlog_elem = None  # First top-level navlog while it is open
+        navlog_seen = False
+        navlog_waypoints = []
+        root = None
+        depth = 0  # Depth of the current element; the root element is depth 1
+        for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                if depth == 1:
+                    root = elem
+                elif depth == 2 and elem.tag == 'navlog' and not navlog_seen:
+                    navlog_seen = True
+                    navlog_elem = elem
+                if depth > 1 and route_elem is None and elem.tag == 'route':
+                    route_elem = elem
+                continue
+            
+            if elem is route_elem and elem.text is not None:
+                route = elem.text
+            if depth == 3 and navlog_elem is not None and elem.tag == 'fix':
+                waypoint = parse_waypoint_from_fix(elem)
+                if waypoint:
+                    navlog_waypoints.append(waypoint)
+                elem.clear()
+                navlog_elem.remove(elem)
+            elif depth == 2:
+                if elem.tag == 'origin' and origin_elem is None:
+                    origin_elem = elem
+                elif elem.tag == 'destination' and dest_elem is None:
+                    dest_elem = elem
+                else:
+                    if elem is navlog_elem:
+                        navlog_elem = None
+                    elem.clear()
+                    root.remove(elem)
+            depth -= 1
         
         origin_code = origin_elem.findtext('icao_code', '') if origin_elem is not None else 'UNKNOWN'
         dest_code = dest_elem.findtext('icao_code', '') if dest_elem is not None else 'UNKNOWN'
-        route = route_elem.text if (route_elem is not None and route_elem.text is not None) else ""
         
         flight_plan = FlightPlan(origin_code, dest_code, route, flight_id)
         
@@ -360,13 +444,9 @@ def extract_flight_plan_from_xml(xml_file: str, flight_id: str = "") -> Optional
             if arrival:
                 flight_plan.set_arrival(arrival)
         
-        # Parse main navlog waypoints
-        navlog = root.find('navlog')
-        if navlog is not None:
-            for fix in navlog.findall('fix'):
-                waypoint = parse_waypoint_from_fix(fix)
-                if waypoint:
-                    flight_plan.add_waypoint(waypoint)
+        # Add main navlog waypoints (parsed during the scan above)
+        for waypoint in navlog_waypoints:
+            flight_plan.add_waypoint(waypoint)
         
         return flight_plan
         
@@ -388,40 +468,41 @@ def interpolate_route_segments(waypoints: List[Waypoint]) -> List[Dict[str, Any]
         List of interpolated segment points
     """
     segments = []
+    append = segments.append
     spacing_nm = INTERPOLATION_SPACING_NM  # Interpolate every X nautical miles (from env.py)
-    for i in range(len(waypoints) - 1):
-        wp1 = waypoints[i]
-        wp2 = waypoints[i + 1]
+    for wp1, wp2 in zip(waypoints, waypoints[1:]):
         segment_distance = calculate_distance_nm(wp1.lat, wp1.lon, wp2.lat, wp2.lon)
         if segment_distance == 0:
             continue
         num_points = max(1, int(segment_distance // spacing_nm))
+        # Per-segment terms are computed once; each point only scales them by t
+        lat1, lon1, alt1 = wp1.lat, wp1.lon, wp1.altitude
+        dlat, dlon, dalt = wp2.lat - lat1, wp2.lon - lon1, wp2.altitude - alt1
+        time1 = wp1.get_time_minutes()
+        dtime = wp2.get_time_minutes() - time1
+        segment_name = f"{wp1.name}-{wp2.name}"
         for j in range(1, num_points + 1):
             t = j / (num_points + 1)
-            lat = wp1.lat + t * (wp2.lat - wp1.lat)
-            lon = wp1.lon + t * (wp2.lon - wp1.lon)
-            alt = int(wp1.altitude + t * (wp2.altitude - wp1.altitude))
-            time = wp1.get_time_minutes() + t * (wp2.get_time_minutes() - wp1.get_time_minutes())
-            segments.append({
-                'lat': lat,
-                'lon': lon,
-                'altitude': alt,
-                'time': time,
-                'segment': f"{wp1.name}-{wp2.name}",
+            append({
+                'lat': lat1 + t * dlat,
+                'lon': lon1 + t * dlon,
+                'altitude': int(alt1 + t * dalt),
+                'time': time1 + t * dtime,
+                'segment': segment_name,
                 'interpolation_point': j
             })
     return segments
 
-def get_phase_for_time(waypoints: List[Waypoint], time_min: float) -> str:
+def get_phase_boundaries(waypoints: List[Waypoint]) -> Tuple[float, float]:
     """
-    Determine phase (climb, cruise, descent) for a given time based on TOC/TOD.
+    Find the TOC and TOD times of a flight plan.
     
     Args:
         waypoints: List of waypoints in the flight plan
-        time_min: Time in minutes from departure
     
     Returns:
-        Flight phase: 'climb', 'cruise', or 'descent'
+        Tuple of (toc_time, tod_time) in minutes from departure; a missing
+        TOC or TOD is returned as infinity
     """
     toc_time = None
     tod_time = None
@@ -437,6 +518,20 @@ def get_phase_for_time(waypoints: List[Waypoint], time_min: float) -> str:
     if tod_time is None:
         tod_time = float('inf')  # If no TOD, treat all as cruise after TOC
     
+    return toc_time, tod_time
+
+def get_phase_at(phase_boundaries: Tuple[float, float], time_min: float) -> str:
+    """
+    Determine phase (climb, cruise, descent) for a given time from TOC/TOD times.
+    
+    Args:
+        phase_boundaries: (toc_time, tod_time) from get_phase_boundaries
+        time_min: Time in minutes from departure
+    
+    Returns:
+        Flight phase: 'climb', 'cruise', or 'descent'
+    """
+    toc_time, tod_time = phase_boundaries
     if time_min < toc_time:
         return 'climb'
     elif time_min < tod_time:
@@ -444,6 +539,19 @@ def get_phase_for_time(waypoints: List[Waypoint], time_min: float) -> str:
     else:
         return 'descent'
 
+def get_phase_for_time(waypoints: List[Waypoint], time_min: float) -> str:
+    """
+    Determine phase (climb, cruise, descent) for a given time based on TOC/TOD.
+    
+    Args:
+        waypoints: List of waypoints in the flight plan
+        time_min: Time in minutes from departure
+    
+    Returns:
+        Flight phase: 'climb', 'cruise', or 'descent'
+    """
+    return get_phase_at(get_phase_boundaries(waypoints), time_min)
+
 def is_conflict_valid(wp1: Waypoint, wp2: Waypoint, distance: float, altitude_diff: int) -> bool:
     """
     Check if a potential conflict meets the criteria.
@@ -465,21 +573,9 @@ def is_conflict_valid(wp1: Waypoint, wp2: Waypoint, distance: float, altitude_di
     if not basic_conflict:
         return False
     
-    # Check if conflict is within no-conflict zones around airports
-    no_conflict_zones = parse_no_conflict_zones()
-    
-    for airport_code, max_distance in no_conflict_zones.items():
-        if airport_code in AIRPORT_COORDINATES:
-            airport_lat, airport_lon = AIRPORT_COORDINATES[airport_code]
-            
-            # Check if either waypoint is within the no-conflict zone
-            airport_lat = AIRPORT_COORDINATES[airport_code]["lat"]
-            airport_lon = AIRPORT_COORDINATES[airport_code]["lon"]
-            dist1 = calculate_distance_nm(wp1.lat, wp1.lon, airport_lat, airport_lon)
-            dist2 = calculate_distance_nm(wp2.lat, wp2.lon, airport_lat, airport_lon)
-            
-            if dist1 < max_distance or dist2 < max_distance:
-                return False  # Conflict is within no-conflict zone
+    # Check if either waypoint is within the no-conflict zones around airports
+    if in_no_conflict_zone(wp1.lat, wp1.lon) or in_no_conflict_zone(wp2.lat, wp2.lon):
+        return False  # Conflict is within no-conflict zone
     
     return True
 
@@ -504,146 +600,311 @@ def is_conflict_valid_segment(seg1: Dict, seg2: Dict, distance: float, altitude_
     if not basic_conflict:
         return False
     
-    # Check if conflict is within no-conflict zones around airports
-    no_conflict_zones = parse_no_conflict_zones()
-    
-    for airport_code, max_distance in no_conflict_zones.items():
-        if airport_code in AIRPORT_COORDINATES:
-            airport_lat, airport_lon = AIRPORT_COORDINATES[airport_code]
-            
-            # Check if either segment is within the no-conflict zone
-            airport_lat = AIRPORT_COORDINATES[airport_code]["lat"]
-            airport_lon = AIRPORT_COORDINATES[airport_code]["lon"]
-            dist1 = calculate_distance_nm(seg1['lat'], seg1['lon'], airport_lat, airport_lon)
-            dist2 = calculate_distance_nm(seg2['lat'], seg2['lon'], airport_lat, airport_lon)
-            
-            if dist1 < max_distance or dist2 < max_distance:
-                return False  # Conflict is within no-conflict zone
+    # Check if either segment is within the no-conflict zones around airports
+    if in_no_conflict_zone(seg1['lat'], seg1['lon']) or in_no_conflict_zone(seg2['lat'], seg2['lon']):
+        return False  # Conflict is within no-conflict zone
     
     return True
 
-def find_potential_conflicts(flight_plans: List[FlightPlan]) -> List[Dict[str, Any]]:
+def with_trig_terms(points: List[Any], coords: List[Tuple[float, float]]) -> List[Tuple[Any, float, float, float]]:
     """
-    Find potential conflicts between flight plans using conflict criteria.
-    Only returns the FIRST conflict between each aircraft pair.
+    Pair each point with the haversine terms of its coordinates.
     
     Args:
-        flight_plans: List of flight plans to analyze
+        points: Waypoints or interpolated segment points
+        coords: (lat, lon) of each point, in the same order
     
     Returns:
-        List of detected first conflicts
+        List of (point, lat_rad, lon_rad, cos_lat) rows
     """
-    potential_conflicts = []
-    first_conflicts = {}  # Track first conflict for each aircraft pair
+    rows = []
+    for point, (lat, lon) in zip(points, coords):
+        lat_rad = math.radians(lat)
+        rows.append((point, lat_rad, math.radians(lon), math.cos(lat_rad)))
+    return rows
+
+def build_latitude_index(rows: List[Tuple[Any, float, float, float]]) -> Tuple[List[float], List[int]]:
+    """
+    Sort point rows by latitude for band queries.
+    
+    Args:
+        rows: (point, lat_rad, lon_rad, cos_lat) rows from with_trig_terms
+    
+    Returns:
+        Tuple of (sorted latitudes in radians, row indices in that order)
+    """
+    order = sorted(range(len(rows)), key=lambda k: rows[k][1])
+    return [rows[k][1] for k in order], order
+
+def build_flight_envelope(waypoint_rows: List[Tuple[Any, float, float, float]],
+                          segment_rows: List[Tuple[Any, float, float, float]]) -> Optional[Tuple[float, float, int, int]]:
+    """
+    Bound the points of a flight that can take part in a conflict.
+    
+    Only points above MIN_ALTITUDE_THRESHOLD (and, for waypoints, not TOC/TOD)
+    are considered, matching the checks in find_potential_conflicts.
+    
+    Args:
+        waypoint_rows: (waypoint, lat_rad, lon_rad, cos_lat) rows from with_trig_terms
+        segment_rows: (segment, lat_rad, lon_rad, cos_lat) rows from with_trig_terms
     
-    for i, fp1 in enumerate(flight_plans):
-        for j, fp2 in enumerate(flight_plans):
-            if i >= j:  # Avoid duplicate comparisons
+    Returns:
+        Tuple of (min lat_rad, max lat_rad, min altitude, max altitude), or None
+        if the flight has no such points
+    """
+    lats = []
+    altitudes = []
+    for wp, lat_rad, _, _ in waypoint_rows:
+        if wp.altitude > MIN_ALTITUDE_THRESHOLD and wp.name not in ("TOC", "TOD"):
+            lats.append(lat_rad)
+            altitudes.append(wp.altitude)
+    for seg, lat_rad, _, _ in segment_rows:
+        if seg['altitude'] > MIN_ALTITUDE_THRESHOLD:
+            lats.append(lat_rad)
+            altitudes.append(seg['altitude'])
+    if not lats:
+        return None
+    return min(lats), max(lats), min(altitudes), max(altitudes)
+
+# Broad phase for the segment scan: the haversine distance is never less than
+# EARTH_RADIUS_NM * |dlat|, so only points within this latitude band of each other
+# can be closer than the lateral threshold (the tiny margin absorbs rounding)
+LATITUDE_BAND_RAD = LATERAL_SEPARATION_THRESHOLD / EARTH_RADIUS_NM * (1 + 1e-9)
+# Narrow phase prefilter: distance < threshold exactly when the haversine term
+# h < sin^2(threshold / 2R), so pairs clearly above that bound skip atan2/sqrt
+HAVERSINE_TERM_LIMIT = math.sin(LATERAL_SEPARATION_THRESHOLD / (2 * EARTH_RADIUS_NM))**2 * (1 + 1e-9)
+
+# Flight pairs each worker process must have before the pair scan is split across
+# processes; below that, pool start-up outweighs the scan itself
+MIN_PAIRS_PER_WORKER = 100
+
+# (flight_ids, flight_columns, flight_envelopes) for find_first_conflict_for_pair,
+# set by init_pair_scan in this process or in each worker
+_pair_scan_state = None
+
+def init_pair_scan(flight_ids: List[str], flight_columns: List[Tuple], flight_envelopes: List[Optional[Tuple]]) -> None:
+    """Install the per-flight data read by find_first_conflict_for_pair."""
+    global _pair_scan_state
+    _pair_scan_state = (flight_ids, flight_columns, flight_envelopes)
+
+def find_first_conflict_for_pair(pair: Tuple[int, int]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    """
+    Find the first conflict between two flights.
+    
+    Args:
+        pair: (i, j) indices of the flights, i < j
+    
+    Returns:
+        Tuple of (skipped, conflict): skipped is True when the flights' envelopes
+        rule out any conflict; conflict is the first conflict dict or None
+    """
+    i, j = pair
+    flight_ids, flight_columns, flight_envelopes = _pair_scan_state
+    sin, atan2, sqrt = math.sin, math.atan2, math.sqrt
+    lat_band = LATITUDE_BAND_RAD
+    h_limit = HAVERSINE_TERM_LIMIT
+    # Per waypoint-pair detail goes to the debug log only; formatting it for every
+    # pair dominated the run when printed
+    log_waypoint_checks = logging.getLogger().isEnabledFor(logging.DEBUG)
+    
+    # Skip the pair outright when the flights' envelopes are further apart than
+    # the lateral threshold in latitude or the vertical threshold in altitude
+    envelope1, envelope2 = flight_envelopes[i], flight_envelopes[j]
+    if (envelope1 is None or envelope2 is None or
+            envelope2[0] - envelope1[1] > lat_band or envelope1[0] - envelope2[1] > lat_band or
+            envelope2[2] - envelope1[3] >= VERTICAL_SEPARATION_THRESHOLD or
+            envelope1[2] - envelope2[3] >= VERTICAL_SEPARATION_THRESHOLD):
+        return True, None
+    
+    phases1, waypoint_rows1, segments1, segment_rows1, _ = flight_columns[i]
+    phases2, waypoint_rows2, segments2, segment_rows2, (sorted_lats2, lat_order2) = flight_columns[j]
+    
+    # Only the first conflict of the pair is kept, so once one is found any
+    # pair of points that are both at or after its time is skipped unchecked
+    first_conflict = None
+    first_time = float('inf')
+    
+    # Check each waypoint pair for conflicts
+    for wp1, lat1_rad, lon1_rad, cos_lat1 in waypoint_rows1:
+        time1 = wp1.get_time_minutes()
+        for wp2, lat2_rad, lon2_rad, cos_lat2 in waypoint_rows2:
+            # Skip TOC and TOD waypoints for conflict detection
+            if wp1.name in ("TOC", "TOD") or wp2.name in ("TOC", "TOD"):
+                continue
+            time2 = wp2.get_time_minutes()
+            if time1 >= first_time and time2 >= first_time:
                 continue
                 
-            waypoints1 = fp1.get_all_waypoints()
-            waypoints2 = fp2.get_all_waypoints()
-            
-            print(f"Checking {fp1.get_route_identifier()} vs {fp2.get_route_identifier()}")
+            # Cheap scalar checks first: skip the haversine for pairs that
+            # can never meet the vertical criteria
+            altitude_diff = abs(wp1.altitude - wp2.altitude)
+            if (altitude_diff >= VERTICAL_SEPARATION_THRESHOLD or
+                    wp1.altitude <= MIN_ALTITUDE_THRESHOLD or
+                    wp2.altitude <= MIN_ALTITUDE_THRESHOLD):
+                continue
             
-            # Check each waypoint pair for conflicts
-            for wp1 in waypoints1:
-                for wp2 in waypoints2:
-                    # Skip TOC and TOD waypoints for conflict detection
-                    if wp1.name in ("TOC", "TOD") or wp2.name in ("TOC", "TOD"):
-                        continue
-                        
-                    distance = calculate_distance_nm(wp1.lat, wp1.lon, wp2.lat, wp2.lon)
-                    altitude_diff = abs(wp1.altitude - wp2.altitude)
-                    
-                    print(f"  Waypoint check: {wp1.name} vs {wp2.name} - Distance: {distance:.1f}nm, Alt diff: {altitude_diff}ft")
-                    
-                    if is_conflict_valid(wp1, wp2, distance, altitude_diff):
-                        phase1 = get_phase_for_time(waypoints1, wp1.get_time_minutes())
-                        phase2 = get_phase_for_time(waypoints2, wp2.get_time_minutes())
-                        
-                        conflict_time = min(wp1.get_time_minutes(), wp2.get_time_minutes())
-                        aircraft_pair = (i, j)
-                        
-                        # Only add if this is the first conflict for this aircraft pair
-                        if aircraft_pair not in first_conflicts or conflict_time < first_conflicts[aircraft_pair]['time']:
-                            conflict = {
-                                'flight1': fp1.get_route_identifier(),
-                                'flight2': fp2.get_route_identifier(),
-                                'flight1_idx': i,
-                                'flight2_idx': j,
-                                'waypoint1': wp1.name,
-                                'waypoint2': wp2.name,
-                                'lat1': wp1.lat,
-                                'lon1': wp1.lon,
-                                'lat2': wp2.lat,
-                                'lon2': wp2.lon,
-                                'alt1': wp1.altitude,
-                                'alt2': wp2.altitude,
-                                'stage1': phase1,
-                                'stage2': phase2,
-                                'time1': wp1.get_time_minutes(),
-                                'time2': wp2.get_time_minutes(),
-                                'distance': distance,
-                                'altitude_diff': altitude_diff,
-                                'conflict_type': 'enroute',
-                                'is_waypoint': True,
-                                'time': conflict_time
-                            }
-                            first_conflicts[aircraft_pair] = conflict
+            dlat = lat2_rad - lat1_rad
+            dlon = lon2_rad - lon1_rad
+            h = sin(dlat/2)**2 + cos_lat1 * cos_lat2 * sin(dlon/2)**2
+            distance = EARTH_RADIUS_NM * (2 * atan2(sqrt(h), sqrt(1-h)))
             
-            # Check interpolated segments for conflicts
-            segments1 = interpolate_route_segments(waypoints1)
-            segments2 = interpolate_route_segments(waypoints2)
+            if log_waypoint_checks:
+                logging.debug("  Waypoint check: %s vs %s - Distance: %.1fnm, Alt diff: %sft",
+                              wp1.name, wp2.name, distance, altitude_diff)
             
-            print(f"  Checking {len(segments1)} segments vs {len(segments2)} segments")
+            # is_conflict_valid criteria, inlined: the vertical checks passed above
+            if (distance < LATERAL_SEPARATION_THRESHOLD and
+                    not in_no_conflict_zone(wp1.lat, wp1.lon) and
+                    not in_no_conflict_zone(wp2.lat, wp2.lon)):
+                conflict_time = min(time1, time2)
+                
+                # Only keep this conflict if it is the first for this aircraft pair
+                if conflict_time < first_time:
+                    first_time = conflict_time
+                    first_conflict = {
+                        'flight1': flight_ids[i],
+                        'flight2': flight_ids[j],
+                        'flight1_idx': i,
+                        'flight2_idx': j,
+                        'waypoint1': wp1.name,
+                        'waypoint2': wp2.name,
+                        'lat1': wp1.lat,
+                        'lon1': wp1.lon,
+                        'lat2': wp2.lat,
+                        'lon2': wp2.lon,
+                        'alt1': wp1.altitude,
+                        'alt2': wp2.altitude,
+                        'stage1': get_phase_at(phases1, time1),
+                        'stage2': get_phase_at(phases2, time2),
+                        'time1': time1,
+                        'time2': time2,
+                        'distance': distance,
+                        'altitude_diff': altitude_diff,
+                        'conflict_type': 'enroute',
+                        'is_waypoint': True,
+                        'time': conflict_time
+                    }
+    
+    # Check interpolated segments for conflicts
+    for seg1, lat1_rad, lon1_rad, cos_lat1 in segment_rows1:
+        time1 = seg1['time']
+        lo = bisect_left(sorted_lats2, lat1_rad - lat_band)
+        hi = bisect_right(sorted_lats2, lat1_rad + lat_band)
+        # Visit the band in route order so the first-conflict tie-break is unchanged
+        for k in sorted(lat_order2[lo:hi]):
+            seg2, lat2_rad, lon2_rad, cos_lat2 = segment_rows2[k]
+            time2 = seg2['time']
+            if time1 >= first_time and time2 >= first_time:
+                continue
+            altitude_diff = abs(seg1['altitude'] - seg2['altitude'])
+            if (altitude_diff >= VERTICAL_SEPARATION_THRESHOLD or
+                    seg1['altitude'] <= MIN_ALTITUDE_THRESHOLD or
+                    seg2['altitude'] <= MIN_ALTITUDE_THRESHOLD):
+                continue
             
-            segment_conflicts = 0
-            for seg1 in segments1:
-                for seg2 in segments2:
-                    distance = calculate_distance_nm(seg1['lat'], seg1['lon'], seg2['lat'], seg2['lon'])
-                    altitude_diff = abs(seg1['altitude'] - seg2['altitude'])
-                    
-                    # Use the same conflict validation logic for segments
-                    if is_conflict_valid_segment(seg1, seg2, distance, altitude_diff):
-                        
-                        segment_conflicts += 1
-                        phase1 = get_phase_for_time(waypoints1, seg1['time'])
-                        phase2 = get_phase_for_time(waypoints2, seg2['time'])
-                        
-                        conflict_time = min(seg1['time'], seg2['time'])
-                        aircraft_pair = (i, j)
-                        
-                        # Only add if this is the first conflict for this aircraft pair
-                        if aircraft_pair not in first_conflicts or conflict_time < first_conflicts[aircraft_pair]['time']:
-                            conflict = {
-                                'flight1': fp1.get_route_identifier(),
-                                'flight2': fp2.get_route_identifier(),
-                                'flight1_idx': i,
-                                'flight2_idx': j,
-                                'waypoint1': f"{seg1['lat']:.4f},{seg1['lon']:.4f}",
-                                'waypoint2': f"{seg2['lat']:.4f},{seg2['lon']:.4f}",
-                                'lat1': seg1['lat'],
-                                'lon1': seg1['lon'],
-                                'lat2': seg2['lat'],
-                                'lon2': seg2['lon'],
-                                'alt1': seg1['altitude'],
-                                'alt2': seg2['altitude'],
-                                'stage1': phase1,
-                                'stage2': phase2,
-                                'time1': seg1['time'],
-                                'time2': seg2['time'],
-                                'distance': distance,
-                                'altitude_diff': altitude_diff,
-                                'conflict_type': 'enroute',
-                                'is_waypoint': False,
-                                'segment1': seg1['segment'],
-                                'segment2': seg2['segment'],
-                                'time': conflict_time
-                            }
-                            first_conflicts[aircraft_pair] = conflict
+            dlat = lat2_rad - lat1_rad
+            dlon = lon2_rad - lon1_rad
+            h = sin(dlat/2)**2 + cos_lat1 * cos_lat2 * sin(dlon/2)**2
+            if h > h_limit:
+                continue
+            distance = EARTH_RADIUS_NM * (2 * atan2(sqrt(h), sqrt(1-h)))
             
-            print(f"  Found {segment_conflicts} segment conflicts")
+            # is_conflict_valid_segment criteria, inlined: the vertical checks passed above
+            if (distance < LATERAL_SEPARATION_THRESHOLD and
+                    not in_no_conflict_zone(seg1['lat'], seg1['lon']) and
+                    not in_no_conflict_zone(seg2['lat'], seg2['lon'])):
+                conflict_time = min(time1, time2)
+                
+                # Only keep this conflict if it is the first for this aircraft pair
+                if conflict_time < first_time:
+                    first_time = conflict_time
+                    first_conflict = {
+                        'flight1': flight_ids[i],
+                        'flight2': flight_ids[j],
+                        'flight1_idx': i,
+                        'flight2_idx': j,
+                        'waypoint1': f"{seg1['lat']:.4f},{seg1['lon']:.4f}",
+                        'waypoint2': f"{seg2['lat']:.4f},{seg2['lon']:.4f}",
+                        'lat1': seg1['lat'],
+                        'lon1': seg1['lon'],
+                        'lat2': seg2['lat'],
+                        'lon2': seg2['lon'],
+                        'alt1': seg1['altitude'],
+                        'alt2': seg2['altitude'],
+                        'stage1': get_phase_at(phases1, time1),
+                        'stage2': get_phase_at(phases2, time2),
+                        'time1': time1,
+                        'time2': time2,
+                        'distance': distance,
+                        'altitude_diff': altitude_diff,
+                        'conflict_type': 'enroute',
+                        'is_waypoint': False,
+                        'segment1': seg1['segment'],
+                        'segment2': seg2['segment'],
+                        'time': conflict_time
+                    }
+    
+    return False, first_conflict
+
+def find_potential_conflicts(flight_plans: List[FlightPlan]) -> List[Dict[str, Any]]:
+    """
+    Find potential conflicts between flight plans using conflict criteria.
+    Only returns the FIRST conflict between each aircraft pair.
+    
+    Flight pairs are independent, so large events scan them in worker processes;
+    results are reported in pair order either way.
+    
+    Args:
+        flight_plans: List of flight plans to analyze
+    
+    Returns:
+        List of detected first conflicts
+    """
+    first_conflicts = {}  # Track first conflict for each aircraft pair
+    
+    # Per-flight columns are built once instead of for every pair the flight is in:
+    # TOC/TOD times, interpolated segments, and the radians/cos(lat) of each point so
+    # the inner loops run the calculate_distance_nm haversine without per-pair trig setup
+    flight_ids = [fp.get_route_identifier() for fp in flight_plans]
+    flight_columns = []
+    flight_envelopes = []
+    for fp in flight_plans:
+        waypoints = fp.get_all_waypoints()
+        segments = interpolate_route_segments(waypoints)
+        waypoint_rows = with_trig_terms(waypoints, [(wp.lat, wp.lon) for wp in waypoints])
+        segment_rows = with_trig_terms(segments, [(seg['lat'], seg['lon']) for seg in segments])
+        flight_columns.append((
+            get_phase_boundaries(waypoints),
+            waypoint_rows,
+            segments,
+            segment_rows,
+            build_latitude_index(segment_rows)
+        ))
+        flight_envelopes.append(build_flight_envelope(waypoint_rows, segment_rows))
+    
+    pairs = [(i, j) for i in range(len(flight_plans)) for j in range(i + 1, len(flight_plans))]
+    workers = min(len(pairs) // MIN_PAIRS_PER_WORKER, os.cpu_count() or 1)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_pair_scan,
+                                 initargs=(flight_ids, flight_columns, flight_envelopes)) as executor:
+            results = list(executor.map(find_first_conflict_for_pair, pairs,
+                                        chunksize=max(1, len(pairs) // (workers * 4))))
+    else:
+        init_pair_scan(flight_ids, flight_columns, flight_envelopes)
+        results = [find_first_conflict_for_pair(pair) for pair in pairs]
+        init_pair_scan(None, None, None)
+    
+    for (i, j), (skipped, conflict) in zip(pairs, results):
+        print(f"Checking {flight_ids[i]} vs {flight_ids[j]}")
+        if skipped:
+            print("  Skipped: flights never come within separation limits")
+            continue
+        print(f"  Checking {len(flight_columns[i][2])} segments vs {len(flight_columns[j][2])} segments")
+        if conflict is not None:
+            first_conflicts[(i, j)] = conflict
+            print(f"  First conflict at {conflict['time']:.1f} min")
+        else:
+            print("  No conflicts found")
     
     # Convert first_conflicts dict to list
     potential_conflicts = list(first_conflicts.values())
@@ -658,8 +919,9 @@ def add_conflict_specific_points(interpolated_data: Dict[str, List[Dict]], confl
     Returns:
         Updated interpolated data with conflict-specific points added
     """
-    from copy import deepcopy
-    updated_data = deepcopy(interpolated_data)
+    # Conflict points are only inserted, never written into existing points, so
+    # copying each route list is enough to leave interpolated_data untouched
+    updated_data = {flight_id: list(route) for flight_id, route in interpolated_data.items()}
 
     def calculate_distance_from_origin(point, origin_point=None):
         """Calculate distance from origin for a waypoint."""
@@ -759,7 +1021,16 @@ def add_conflict_specific_points(interpolated_data: Dict[str, List[Dict]], confl
 # REPORTING FUNCTIONS
 # =============================================================================
 
-def build_route_waypoints(conflicts: List[Dict[str, Any]]) -> Dict[str, Dict[str, Tuple[float, float]]]:
+# Route waypoint entry: (lat, lon, lat_rad, lon_rad, cos_lat). The radian and
+# cosine terms are computed once so nearest-waypoint searches skip them.
+WaypointEntry = Tuple[float, float, float, float, float]
+
+def make_waypoint_entry(lat: float, lon: float) -> WaypointEntry:
+    """Build a route waypoint entry with its trig terms precomputed."""
+    lat_rad = math.radians(lat)
+    return (lat, lon, lat_rad, math.radians(lon), math.cos(lat_rad))
+
+def build_route_waypoints(conflicts: List[Conflict]) -> Dict[str, Dict[str, WaypointEntry]]:
     """
     Build a database of waypoints organized by route.
     
@@ -767,18 +1038,14 @@ def build_route_waypoints(conflicts: List[Dict[str, Any]]) -> Dict[str, Dict[str
         conflicts: List of conflicts to extract waypoints from
     
     Returns:
-        Dictionary mapping routes to their waypoints
+        Dictionary mapping routes to their waypoint entries
     """
     route_waypoints = {}
     
     for conflict in conflicts:
-        if conflict.get('is_waypoint', True):
-            route1 = conflict['flight1']
-            route2 = conflict['flight2']
-            wp1 = conflict['waypoint1']
-            wp2 = conflict['waypoint2']
-            lat1, lon1 = conflict['lat1'], conflict['lon1']
-            lat2, lon2 = conflict['lat2'], conflict['lon2']
+        if conflict.is_waypoint:
+            route1 = conflict.flight1
+            route2 = conflict.flight2
             
             # Add waypoints to their respective routes
             if route1 not in route_waypoints:
@@ -786,73 +1053,101 @@ def build_route_waypoints(conflicts: List[Dict[str, Any]]) -> Dict[str, Dict[str
             if route2 not in route_waypoints:
                 route_waypoints[route2] = {}
             
-            route_waypoints[route1][wp1] = (lat1, lon1)
-            route_waypoints[route2][wp2] = (lat2, lon2)
+            route_waypoints[route1][conflict.waypoint1] = make_waypoint_entry(conflict.lat1, conflict.lon1)
+            route_waypoints[route2][conflict.waypoint2] = make_waypoint_entry(conflict.lat2, conflict.lon2)
     
     return route_waypoints
 
-def find_nearest_waypoint_from_routes(lat: float, lon: float, route1: str, route2: str, 
-                                     route_waypoints: Dict[str, Dict[str, Tuple[float, float]]]) -> Tuple[str, float]:
+def get_route_pair_waypoints(route1: str, route2: str,
+                             route_waypoints: Dict[str, Dict[str, WaypointEntry]]) -> List[Tuple[str, WaypointEntry]]:
     """
-    Find the nearest waypoint from the two routes involved in the conflict.
+    Combine the waypoints of two routes into one candidate list.
     
     Args:
-        lat, lon: Coordinates of the conflict point
         route1, route2: Route identifiers
         route_waypoints: Dictionary of route waypoints
     
     Returns:
-        Tuple of (nearest waypoint name, distance)
+        List of (waypoint name, entry) tuples, route1 waypoints first
     """
-    min_distance = float('inf')
-    nearest_waypoint = "UNKNOWN"
+    return [
+        (wp_name, entry)
+        for route in (route1, route2) if route in route_waypoints
+        for wp_name, entry in route_waypoints[route].items()
+    ]
+
+def find_nearest_waypoint_from_routes(lat: float, lon: float,
+                                     candidates: List[Tuple[str, WaypointEntry]]) -> Tuple[str, float, Optional[Tuple[float, float]]]:
+    """
+    Find the nearest waypoint from the two routes involved in the conflict.
+    
+    Uses the same haversine as calculate_distance_nm, with the waypoint-side
+    radians and cosine taken from the precomputed entries.
     
-    # Check waypoints from both routes
-    for route in [route1, route2]:
-        if route in route_waypoints:
-            for wp_name, (wp_lat, wp_lon) in route_waypoints[route].items():
-                distance = calculate_distance_nm(lat, lon, wp_lat, wp_lon)
-                if distance < min_distance:
-                    min_distance = distance
-                    nearest_waypoint = wp_name
+    Args:
+        lat, lon: Coordinates of the conflict point
+        candidates: Combined waypoints of both routes (see get_route_pair_waypoints)
     
-    return nearest_waypoint, min_distance
+    Returns:
+        Tuple of (nearest waypoint name, distance, waypoint coordinates or None)
+    """
+    min_distance = float('inf')
+    nearest_waypoint = "UNKNOWN"
+    nearest_coords = None
+    
+    lat_rad = math.radians(lat)
+    lon_rad = math.radians(lon)
+    cos_lat = math.cos(lat_rad)
+    
+    for wp_name, (wp_lat, wp_lon, wp_lat_rad, wp_lon_rad, wp_cos_lat) in candidates:
+        dlat = wp_lat_rad - lat_rad
+        dlon = wp_lon_rad - lon_rad
+        a = math.sin(dlat/2)**2 + cos_lat * wp_cos_lat * math.sin(dlon/2)**2
+        distance = EARTH_RADIUS_NM * (2 * math.atan2(math.sqrt(a), math.sqrt(1-a)))
+        if distance < min_distance:
+            min_distance = distance
+            nearest_waypoint = wp_name
+            nearest_coords = (wp_lat, wp_lon)
+    
+    return nearest_waypoint, min_distance, nearest_coords
 
-def format_location(conflict: Dict[str, Any], all_conflicts: List[Dict[str, Any]]) -> str:
+def format_location(conflict: Conflict, route_waypoints: Dict[str, Dict[str, WaypointEntry]],
+                    pair_cache: Optional[Dict[frozenset, List[Tuple[str, WaypointEntry]]]] = None) -> str:
     """
     Format location as distance and direction from nearest waypoint.
     
     Args:
         conflict: Conflict to format location for
-        all_conflicts: All conflicts for waypoint database
+        route_waypoints: Waypoint database from build_route_waypoints
+        pair_cache: Optional cache of combined waypoints per route pair, shared
+            across calls so conflicts on the same pair of routes reuse it
     
     Returns:
         Formatted location string
     """
-    if conflict.get('is_waypoint', True):
-        return f"{conflict['waypoint1']}/{conflict['waypoint2']}"
+    if conflict.is_waypoint:
+        return f"{conflict.waypoint1}/{conflict.waypoint2}"
     else:
         # For interpolated conflicts, find nearest waypoint from the two routes
-        lat = conflict['lat1']
-        lon = conflict['lon1']
-        route1 = conflict['flight1']
-        route2 = conflict['flight2']
+        lat = conflict.lat1
+        lon = conflict.lon1
+        route1 = conflict.flight1
+        route2 = conflict.flight2
         
-        # Build route waypoints database
-        route_waypoints = build_route_waypoints(all_conflicts)
-        nearest_wp, distance = find_nearest_waypoint_from_routes(lat, lon, route1, route2, route_waypoints)
+        # Combined waypoints are keyed by the unordered route pair
+        pair_key = frozenset((route1, route2))
+        candidates = pair_cache.get(pair_key) if pair_cache is not None else None
+        if candidates is None:
+            candidates = get_route_pair_waypoints(route1, route2, route_waypoints)
+            if pair_cache is not None:
+                pair_cache[pair_key] = candidates
         
-        if nearest_wp != "UNKNOWN":
-            # Get waypoint coordinates from the route it belongs to
-            wp_lat, wp_lon = None, None
-            for route in [route1, route2]:
-                if route in route_waypoints and nearest_wp in route_waypoints[route]:
-                    wp_lat, wp_lon = route_waypoints[route][nearest_wp]
-                    break
-            
-            if wp_lat is not None and wp_lon is not None:
-                direction = get_compass_direction(wp_lat, wp_lon, lat, lon)
-                return f"{distance:.1f} nm {direction} of {nearest_wp}"
+        nearest_wp, distance, nearest_coords = find_nearest_waypoint_from_routes(lat, lon, candidates)
+        
+        if nearest_coords is not None:
+            wp_lat, wp_lon = nearest_coords
+            direction = get_compass_direction(wp_lat, wp_lon, lat, lon)
+            return f"{distance:.1f} nm {direction} of {nearest_wp}"
         
         return f"{lat:.4f},{lon:.4f}"
 
@@ -887,48 +1182,61 @@ def print_and_write_conflict_report(data: Dict[str, Any], output_file: str = CON
         return
 
     # Use conflicts directly since "first conflict" logic already handles duplicates
-    filtered_conflicts = conflicts
+    filtered_conflicts = [Conflict.from_dict(c) for c in conflicts]
     
     print(f"\nTotal First Conflicts: {len(filtered_conflicts)}\n")
     output.append("")
     output.append(f"Total First Conflicts: {len(filtered_conflicts)}")
     output.append("")
     
-    # Get aircraft types for display
+    # Get aircraft types for display, formatted once per flight
     flights_dict = data.get('flights', {})
+    flight_labels = {
+        flight_id: f"{flight_id} ({info.get('aircraft_type', 'UNK')})"
+        for flight_id, info in flights_dict.items()
+    }
+    routes_with_conflicts = set()
+    
+    # Waypoint conflicts format directly; interpolated ones need the waypoint
+    # database, so split them up front and only build it when required
+    wp_conflicts = [(k, c) for k, c in enumerate(filtered_conflicts) if c.is_waypoint]
+    interp_conflicts = [(k, c) for k, c in enumerate(filtered_conflicts) if not c.is_waypoint]
+    locations = [""] * len(filtered_conflicts)
+    
+    for k, conflict in wp_conflicts:
+        locations[k] = f"{conflict.waypoint1}/{conflict.waypoint2}"
+    
+    if interp_conflicts:
+        route_waypoints = build_route_waypoints([c for _, c in wp_conflicts])
+        # Combined waypoints per route pair, shared by all conflicts on that pair
+        pair_cache = {}
+        for k, conflict in interp_conflicts:
+            location_str = format_location(conflict, route_waypoints, pair_cache)
+            if conflict.segment1 and conflict.segment2:
+                location_str += f" (segments: {conflict.segment1}/{conflict.segment2})"
+            locations[k] = location_str
     
     # Print each conflict
     for i, conflict in enumerate(filtered_conflicts, 1):
         conflict_output = []
+        routes_with_conflicts.add(conflict.flight1)
+        routes_with_conflicts.add(conflict.flight2)
         
-        # Get aircraft types
-        flight1_type = flights_dict.get(conflict['flight1'], {}).get('aircraft_type', 'UNK')
-        flight2_type = flights_dict.get(conflict['flight2'], {}).get('aircraft_type', 'UNK')
+        label1 = flight_labels.get(conflict.flight1) or f"{conflict.flight1} (UNK)"
+        label2 = flight_labels.get(conflict.flight2) or f"{conflict.flight2} (UNK)"
+        conflict_output.append(f"{i}. {label1} & {label2}")
         
-        conflict_output.append(f"{i}. {conflict['flight1']} ({flight1_type}) & {conflict['flight2']} ({flight2_type})")
+        conflict_type = "at waypoint" if conflict.is_waypoint else "between waypoints"
         
-        # Format location
-        location_str = format_location(conflict, conflicts)
-        is_waypoint = conflict.get('is_waypoint', True)
-        
-        if is_waypoint:
-            conflict_type = "at waypoint"
-        else:
-            conflict_type = "between waypoints"
-            segment1 = conflict.get('segment1', '')
-            segment2 = conflict.get('segment2', '')
-            if segment1 and segment2:
-                location_str += f" (segments: {segment1}/{segment2})"
-        
-        conflict_output.append(f"   Location: {location_str}")
+        conflict_output.append(f"   Location: {locations[i - 1]}")
         conflict_output.append(f"   Conflict Type: {conflict_type}")
-        conflict_output.append(f"   Distance: {conflict['distance']:.1f} nm")
-        conflict_output.append(f"   Altitudes: {conflict['alt1']}/{conflict['alt2']} ft")
-        conflict_output.append(f"   Altitude Diff: {conflict['altitude_diff']} ft")
+        conflict_output.append(f"   Distance: {conflict.distance:.1f} nm")
+        conflict_output.append(f"   Altitudes: {conflict.alt1}/{conflict.alt2} ft")
+        conflict_output.append(f"   Altitude Diff: {conflict.altitude_diff} ft")
         
         # Format arrival times
-        f1 = conflict.get('flight1_arrival', 'N/A')
-        f2 = conflict.get('flight2_arrival', 'N/A')
+        f1 = conflict.flight1_arrival if conflict.flight1_arrival is not None else 'N/A'
+        f2 = conflict.flight2_arrival if conflict.flight2_arrival is not None else 'N/A'
         try:
             f1_disp = str(int(round(f1))) if isinstance(f1, (int, float)) else str(f1)
             f2_disp = str(int(round(f2))) if isinstance(f2, (int, float)) else str(f2)
@@ -939,9 +1247,7 @@ def print_and_write_conflict_report(data: Dict[str, Any], output_file: str = CON
         conflict_output.append(f"   Arrival Times: {f1_disp} vs {f2_disp} min")
         
         # Add phase information
-        phase1 = conflict.get('stage1', '?')
-        phase2 = conflict.get('stage2', '?')
-        conflict_output.append(f"   Phase: {phase1}/{phase2}")
+        conflict_output.append(f"   Phase: {conflict.stage1}/{conflict.stage2}")
         conflict_output.append("")
         
         # Print to terminal
@@ -952,11 +1258,6 @@ def print_and_write_conflict_report(data: Dict[str, Any], output_file: str = CON
         output.extend(conflict_output)
     
     # Show routes without conflicts
-    routes_with_conflicts = set()
-    for conflict in conflicts:
-        routes_with_conflicts.add(conflict['flight1'])
-        routes_with_conflicts.add(conflict['flight2'])
-    
     routes_without_conflicts = sorted(all_routes - routes_with_conflicts)
     
     print("")
@@ -964,13 +1265,9 @@ def print_and_write_conflict_report(data: Dict[str, Any], output_file: str = CON
     output.append("")
     output.append("The following routes do not have any first conflicts:")
     
-    if routes_without_conflicts:
-        for route in routes_without_conflicts:
-            print(route)
-            output.append(route)
-    else:
-        print("(All routes have at least one first conflict)")
-        output.append("(All routes have at least one first conflict)")
+    block = "\n".join(routes_without_conflicts) or "(All routes have at least one first conflict)"
+    print(block)
+    output.append(block)
     
     # Write to file
     with open(output_file, "w", encoding="utf-8") as f:
@@ -1066,6 +1363,12 @@ def extract_flight_plans() -> List[FlightPlan]:
     
     return flight_plans
 
+def write_json(path: str, obj: Any) -> None:
+    """Encode obj in one pass and write it with a single call (json.dump issues one write per token)"""
+    payload = json.dumps(obj, indent=2)
+    with open(path, 'w') as f:
+        f.write(payload)
+
 def save_analysis_data(analysis: Dict[str, Any]) -> None:
     """
     Save analysis data to JSON file.
@@ -1079,8 +1382,7 @@ def save_analysis_data(analysis: Dict[str, Any]) -> None:
         logging.info(f"Created temp directory: {TEMP_DIRECTORY}")
     
     analysis_file = os.path.join(TEMP_DIRECTORY, CONFLICT_ANALYSIS_FILE)
-    with open(analysis_file, 'w') as f:
-        json.dump(analysis, f, indent=2)
+    write_json(analysis_file, analysis)
     
     logging.info(f"Analysis data saved to {analysis_file}")
 
@@ -1116,13 +1418,14 @@ def main() -> None:
     
     # Keep times as minutes after departure for internal processing
     
-    # Write to temp file
+    # Write to temp file; with conflicts to analyze it is written once, after the
+    # conflict-specific points are added
     temp_dir = 'temp'
     os.makedirs(temp_dir, exist_ok=True)
-    with open(os.path.join(temp_dir, 'routes_with_added_interpolated_points.json'), 'w') as f:
-        json.dump(routes_with_interpolated, f, indent=2)
+    routes_file = os.path.join(temp_dir, 'routes_with_added_interpolated_points.json')
     
     if len(flight_plans) < 2:
+        write_json(routes_file, routes_with_interpolated)
         print("Need at least 2 flight plans to analyze conflicts")
         logging.error("Insufficient flight plans for analysis")
         return
@@ -1137,8 +1440,7 @@ def main() -> None:
     
     # Add conflict-specific interpolation points and update the file
     routes_with_interpolated = add_conflict_specific_points(routes_with_interpolated, potential_conflicts)
-    with open(os.path.join(temp_dir, 'routes_with_added_interpolated_points.json'), 'w') as f:
-        json.dump(routes_with_interpolated, f, indent=2)
+    write_json(routes_file, routes_with_interpolated)
     
     # Generate conflict scenario
     scenario = generate_conflict_scenario(flight_plans, potential_conflicts)
@@ -15,6 +15,7 @@ Recent Changes:
 - Removed x/y projected coordinates (Cesium only uses lat/lon/altitude)
 - Reads departure times from interpolated points metadata (not pilot_briefing.txt)
 - Simplified data structure for cleaner output
+- Track waypoints are stored column-wise ({'lat': [...], 'lon': [...], ...})
 - Eliminated circular dependency with scheduling
 - Updated to handle new flight ID system instead of origin-destination pairs
 - **REMOVED XML DEPENDENCY**: Now uses only the single source of truth
@@ -25,18 +26,23 @@ Input files:
 Output files:
 - animation_data.json (complete animation data, simplified structure)
 - conflict_points.json (conflict locations and timing)
+- flight_tracks.jsonl, conflict_points.jsonl (one JSON record per line)
+- flight_tracks.bin + flight_tracks_index.json (float32 track points and per-flight offsets)
 """
 
 import json
-import csv
-import re
 import os
 import logging
 import math
+import sys
+import functools
+from array import array
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional, Iterator
 from env import MIN_ALTITUDE_THRESHOLD, LATERAL_SEPARATION_THRESHOLD, VERTICAL_SEPARATION_THRESHOLD
+from env import ANIMATION_CONFLICT_BBOX
 from collections import defaultdict
+from operator import itemgetter
 
 # =============================================================================
 # Animation Data Generation Script
@@ -51,15 +57,63 @@ from collections import defaultdict
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Enhanced routes file (single source of truth)
+INTERPOLATED_ROUTES_PATH = os.path.join('temp', 'routes_with_added_interpolated_points.json')
+
+# Decimal places kept for exported lat/lon (6 places is ~0.1 m, well below what
+# the viewer can resolve); trims the interpolated float noise from the output
+COORD_DECIMALS = 6
+
+# Separators for machine-read JSON: no whitespace after ',' and ':'
+COMPACT_SEPARATORS = (',', ':')
+
+# Binary track companion: little-endian float32 records, one per track point.
+# flight_tracks_index.json maps each flight to its byte offset and point count.
+TRACK_BIN_FIELDS = ('lat', 'lon', 'altitude', 'minutes_since_event_start')
+
+@functools.lru_cache(maxsize=8)
+def _read_routes(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a routes file; keyed on mtime so a rewritten file is parsed again"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def write_json(path: str, obj: Any) -> None:
+    """Encode obj in one pass and write it with a single call (json.dump issues one write per token)"""
+    payload = json.dumps(obj, indent=2)
+    with open(path, 'w') as f:
+        f.write(payload)
+
+def pack_track_points(waypoints: Dict[str, list], event_start_minutes: int) -> array:
+    """Pack column-wise track waypoints into float32 records laid out as TRACK_BIN_FIELDS"""
+    points = array('f')
+    for lat, lon, altitude, hhmm in zip(waypoints['lat'], waypoints['lon'],
+                                        waypoints['altitude'], waypoints['UTC time']):
+        if hhmm:
+            minutes = (int(hhmm[:2]) * 60 + int(hhmm[2:]) - event_start_minutes) % (24 * 60)
+        else:
+            minutes = math.nan
+        points.extend((lat, lon, altitude, minutes))
+    if sys.byteorder == 'big':
+        points.byteswap()
+    return points
+
+def write_jsonl(path: str, records: List[Dict]) -> None:
+    """Write one compact JSON object per line so consumers can parse records incrementally"""
+    with open(path, 'w') as f:
+        f.writelines(json.dumps(record, separators=COMPACT_SEPARATORS) + '\n' for record in records)
+
 class AnimationDataGenerator:
     """Generates animation data from existing analysis for 3D visualization"""
     
-    def __init__(self):
+    def __init__(self, conflict_bbox: Optional[Tuple[float, float, float, float]] = ANIMATION_CONFLICT_BBOX):
+        self.conflict_bbox = conflict_bbox  # (min_lat, max_lat, min_lon, max_lon) or None
         self.flights = {}
         self.conflicts = []
         self.schedule = {}
         self.event_start_time = None
         self.event_end_time = None
+        self._event_start = None  # (event_start_time, minutes since midnight), see minutes_to_utc_hhmm
+        self._routes = None  # Enhanced routes data, loaded once by load_routes()
         self.animation_data = {
             'metadata': {
                 'total_flights': 0,
@@ -72,16 +126,27 @@ class AnimationDataGenerator:
             'timeline': []
         }
     
+    def load_routes(self) -> Optional[Dict[str, Any]]:
+        """Load the enhanced routes file once; later calls reuse the parsed data.
+        
+        The parse is shared between generators in the same process while the file
+        is unchanged, so the returned data must be treated as read-only.
+        """
+        if self._routes is None:
+            try:
+                mtime_ns = os.stat(INTERPOLATED_ROUTES_PATH).st_mtime_ns
+            except FileNotFoundError:
+                return None
+            self._routes = _read_routes(INTERPOLATED_ROUTES_PATH, mtime_ns)
+        return self._routes
+    
     def load_schedule(self) -> bool:
         """Load departure schedule from interpolated points file metadata"""
         try:
-            interp_path = 'temp/routes_with_added_interpolated_points.json'
-            if not os.path.exists(interp_path):
-                logger.warning(f"Interpolated points file not found: {interp_path}")
+            routes = self.load_routes()
+            if routes is None:
+                logger.warning(f"Interpolated points file not found: {INTERPOLATED_ROUTES_PATH}")
                 return False
-                
-            with open(interp_path, 'r') as f:
-                routes = json.load(f)
             
             # Check if metadata exists
             if '_metadata' not in routes or 'departure_schedule' not in routes['_metadata']:
@@ -118,13 +183,10 @@ class AnimationDataGenerator:
         conflict_timing = {}
         
         try:
-            interp_path = 'temp/routes_with_added_interpolated_points.json'
-            if not os.path.exists(interp_path):
-                logger.warning(f"Interpolated points file not found: {interp_path}")
+            routes = self.load_routes()
+            if routes is None:
+                logger.warning(f"Interpolated points file not found: {INTERPOLATED_ROUTES_PATH}")
                 return conflict_timing
-                
-            with open(interp_path, 'r') as f:
-                routes = json.load(f)
             
             # Extract conflict timing from metadata if available
             if '_metadata' in routes and 'departure_schedule' in routes['_metadata']:
@@ -139,13 +201,10 @@ class AnimationDataGenerator:
         """Parse conflict distances from interpolated points metadata"""
         conflict_distances = {}
         try:
-            interp_path = 'temp/routes_with_added_interpolated_points.json'
-            if not os.path.exists(interp_path):
-                logger.warning(f"Interpolated points file not found: {interp_path}")
+            routes = self.load_routes()
+            if routes is None:
+                logger.warning(f"Interpolated points file not found: {INTERPOLATED_ROUTES_PATH}")
                 return conflict_distances
-                
-            with open(interp_path, 'r') as f:
-                routes = json.load(f)
             
             # Extract conflict distances from metadata if available
             if '_metadata' in routes:
@@ -157,17 +216,20 @@ class AnimationDataGenerator:
 
     def generate_flight_tracks(self) -> List[Dict]:
         """Generate animation tracks for each flight from enhanced routes file (single source of truth)"""
-        tracks = []
+        return list(self.iter_flight_tracks())
+    
+    def iter_flight_tracks(self) -> Iterator[Dict]:
+        """Yield animation tracks one flight at a time so callers can write them as they are built"""
         # Load enhanced routes file (single source of truth)
-        interpolated_path = os.path.join('temp', 'routes_with_added_interpolated_points.json')
-        interpolated_data = None
-        if os.path.exists(interpolated_path):
-            with open(interpolated_path, 'r') as f:
-                interpolated_data = json.load(f)
-                logger.info(f"Loaded enhanced routes data with {len(interpolated_data)} flights")
+        interpolated_data = self.load_routes()
+        if interpolated_data is not None:
+            logger.info(f"Loaded enhanced routes data with {len(interpolated_data)} flights")
         else:
-            logger.warning(f"Enhanced routes file not found: {interpolated_path}")
-            return tracks
+            logger.warning(f"Enhanced routes file not found: {INTERPOLATED_ROUTES_PATH}")
+            return
+        
+        # Ensure all flight_id values are unique by appending a suffix to duplicates
+        flight_id_counts = defaultdict(int)
         
         # Use flight names from schedule
         flight_names = list(self.schedule.keys())
@@ -204,18 +266,15 @@ class AnimationDataGenerator:
                     arrival = name
                     break
             
-            # Build track waypoints
-            track_waypoints = []
-            for i, wp in enumerate(waypoints):
-                track_waypoints.append({
-                    'index': i,
-                    'name': wp.get('name', ''),
-                    'lat': wp['lat'],
-                    'lon': wp['lon'],
-                    'altitude': wp['altitude'],
-                    'UTC time': wp.get('time', ''),
-                    'stage': wp.get('stage', '')
-                })
+            # Build track waypoints as parallel columns (one list per field, index = position)
+            track_waypoints = {
+                'name': [wp.get('name', '') for wp in waypoints],
+                'lat': [round(wp['lat'], COORD_DECIMALS) for wp in waypoints],
+                'lon': [round(wp['lon'], COORD_DECIMALS) for wp in waypoints],
+                'altitude': [int(wp['altitude']) for wp in waypoints],
+                'UTC time': [wp.get('time', '') for wp in waypoints],
+                'stage': [wp.get('stage', '') for wp in waypoints]
+            }
             
             # Get aircraft type from enhanced data
             aircraft_type = flight_data.get('aircraft_type', 'UNK')
@@ -234,37 +293,29 @@ class AnimationDataGenerator:
                 'waypoints': track_waypoints,
                 'conflicts': conflicts
             }
-            tracks.append(track)
-        
-        # Ensure all flight_id values are unique by appending a suffix to duplicates
-        flight_id_counts = defaultdict(int)
-        for track in tracks:
-            base_id = track['flight_id']
-            flight_id_counts[base_id] += 1
-            if flight_id_counts[base_id] > 1:
-                track['flight_id'] = f"{base_id}-{flight_id_counts[base_id]}"
-        
-        return tracks
+            flight_id_counts[flight_id] += 1
+            if flight_id_counts[flight_id] > 1:
+                track['flight_id'] = f"{flight_id}-{flight_id_counts[flight_id]}"
+            yield track
     
     def add_minutes_to_hhmm(self, hhmm: str, minutes: float) -> str:
         # Add float minutes to a HHMM string, return new HHMM string
-        h = int(hhmm[:2])
-        m = int(hhmm[2:])
-        total = h * 60 + m + minutes
-        total = int(round(total))
-        hours = (total // 60) % 24
-        mins = total % 60
+        total = int(round(int(hhmm[:2]) * 60 + int(hhmm[2:]) + minutes))
+        hours, mins = divmod(total % (24 * 60), 60)
         return f"{hours:02d}{mins:02d}"
 
-    def minutes_to_utc_hhmm(self, minutes: float) -> str:
+    def event_start_minutes(self) -> int:
+        """Event start as minutes since midnight UTC, parsed once per start time"""
         if not self.event_start_time:
             raise ValueError("Event start time not set!")
-        h = int(self.event_start_time[:2])
-        m = int(self.event_start_time[2:])
-        event_start_minutes = h * 60 + m
-        total_minutes = int(round(minutes)) + event_start_minutes
-        hours = (total_minutes // 60) % 24
-        mins = total_minutes % 60
+        if self._event_start is None or self._event_start[0] != self.event_start_time:
+            self._event_start = (self.event_start_time,
+                                 int(self.event_start_time[:2]) * 60 + int(self.event_start_time[2:]))
+        return self._event_start[1]
+
+    def minutes_to_utc_hhmm(self, minutes: float) -> str:
+        total_minutes = int(round(minutes)) + self.event_start_minutes()
+        hours, mins = divmod(total_minutes % (24 * 60), 60)
         return f"{hours:02d}{mins:02d}"
 
     def float_minutes_to_hhmm(self, minutes: float) -> str:
@@ -307,10 +358,8 @@ class AnimationDataGenerator:
         conflict_points = []
         processed_pairs = set()  # Track processed aircraft pairs to avoid duplicates (unordered pair)
         # Load enhanced routes file (single source of truth)
-        try:
-            with open('temp/routes_with_added_interpolated_points.json', 'r') as f:
-                enhanced_routes = json.load(f)
-        except FileNotFoundError:
+        enhanced_routes = self.load_routes()
+        if enhanced_routes is None:
             logger.error("Enhanced routes file not found")
             return conflict_points
 
@@ -325,8 +374,10 @@ class AnimationDataGenerator:
             return 2 * _math.atan2(_math.sqrt(a), _math.sqrt(1 - a)) * 3440.065
 
         # Build flight windows and route lookup: flight_id -> (first_mins, last_mins, route)
+        # Point times are converted to minutes once here and reused by the spatial check
         flight_windows: Dict[str, tuple] = {}
         flight_routes: Dict[str, list] = {}
+        flight_times: Dict[str, List[int]] = {}
         for fid, fd in enhanced_routes.items():
             if fid == '_metadata' or not isinstance(fd, dict):
                 continue
@@ -335,12 +386,14 @@ class AnimationDataGenerator:
                 times = [hhmm_to_mins(str(w['time'])) for w in route]
                 flight_windows[fid] = (min(times), max(times))
                 flight_routes[fid] = route
+                flight_times[fid] = times
 
         # Max distance an aircraft can be from the conflict point and still be valid (nm).
         # Conflicts are detected at <=5nm separation; 20nm allows for interpolation gaps.
         SPATIAL_THRESHOLD_NM = 20.0
 
         phantom_count = 0
+        outside_count = 0
         # Extract conflicts from enhanced routes data
         for flight_id, flight_data in enhanced_routes.items():
             if flight_id == '_metadata':
@@ -358,6 +411,13 @@ class AnimationDataGenerator:
                     continue
                 processed_pairs.add(pair_key)
 
+                # Cheap envelope test first: skip conflicts outside the export area
+                if self.conflict_bbox is not None:
+                    min_lat, max_lat, min_lon, max_lon = self.conflict_bbox
+                    if not (min_lat <= conflict['lat'] <= max_lat and min_lon <= conflict['lon'] <= max_lon):
+                        outside_count += 1
+                        continue
+
                 conflict_time_mins = hhmm_to_mins(str(conflict['conflict_time_utc']))
                 w1 = flight_windows.get(flight_id)
                 w2 = flight_windows.get(other_flight)
@@ -380,7 +440,8 @@ class AnimationDataGenerator:
                     route = flight_routes.get(fid, [])
                     if not route:
                         continue
-                    nearest = min(route, key=lambda w: abs(hhmm_to_mins(str(w['time'])) - conflict_time_mins))
+                    times = flight_times[fid]
+                    nearest = route[min(range(len(times)), key=lambda k: abs(times[k] - conflict_time_mins))]
                     d = _dist_nm(clat, clon, nearest['lat'], nearest['lon'])
                     if d > SPATIAL_THRESHOLD_NM:
                         logger.warning(
@@ -396,8 +457,8 @@ class AnimationDataGenerator:
                 conflict_point = {
                     'id': f"conflict_{flight_id}_{other_flight}",
                     'location': f"{flight_id}-{other_flight}",
-                    'lat': conflict['lat'],
-                    'lon': conflict['lon'],
+                    'lat': round(conflict['lat'], COORD_DECIMALS),
+                    'lon': round(conflict['lon'], COORD_DECIMALS),
                     'altitude': conflict['alt'],
                     'flight1': flight_id,
                     'flight2': other_flight,
@@ -411,20 +472,25 @@ class AnimationDataGenerator:
                 conflict_points.append(conflict_point)
         logger.info(
             f"Generated {len(conflict_points)} unique conflict points from enhanced routes data "
-            f"(deduped by unordered pair, {phantom_count} phantom conflicts removed)"
+            f"(deduped by unordered pair, {phantom_count} phantom conflicts removed"
+            f"{f', {outside_count} outside export bbox' if outside_count else ''})"
         )
         return conflict_points
     
     def generate_timeline(self) -> List[Dict]:
-        """Generate complete animation timeline"""
-        timeline = []
+        """Generate complete animation timeline, ordered by minutes since event start"""
+        start = int(self.event_start_time[:2]) * 60 + int(self.event_start_time[2:])
+        events = []
         for flight_id, departure_time in self.schedule.items():
-            timeline.append({
+            minutes = int(departure_time[:2]) * 60 + int(departure_time[2:])
+            events.append(((minutes - start) % (24 * 60), {
                 'time': departure_time,
                 'type': 'departure',
                 'flight_id': flight_id,
                 'action': 'depart'
-            })
+            }))
+        events.sort(key=itemgetter(0))
+        timeline = [event for _, event in events]
         # Add conflict events
         # The conflicts list is no longer populated here, so this loop will be empty
         # if the conflict_points generation is the only source of conflict data.
@@ -436,8 +502,7 @@ class AnimationDataGenerator:
     def generate_animation_data(self) -> bool:
         """Generate all animation data to JSON files"""
         try:
-            # Generate animation data
-            tracks = self.generate_flight_tracks()
+            # Generate animation data (flight tracks are streamed to disk below)
             conflict_points = self.generate_conflict_points()
             timeline = self.generate_timeline()
             
@@ -457,33 +522,83 @@ class AnimationDataGenerator:
             
             logger.info(f"Altitude filtering complete: {len(filtered_conflicts)} conflicts remaining out of {len(conflict_points)}")
             
-            # Update metadata
-            self.animation_data['metadata'].update({
-                'total_flights': len(tracks),
-                'total_conflicts': len(filtered_conflicts),
-                'event_duration': len(timeline),
-                'event_start': self.event_start_time,
-                'event_end': self.event_end_time
-            })
-            
-            self.animation_data['flights'] = tracks
             self.animation_data['conflicts'] = filtered_conflicts
             self.animation_data['timeline'] = timeline
             
-            # Generate main animation data
-            with open('animation/animation_data.json', 'w') as f:
-                json.dump(self.animation_data, f, indent=2)
+            # Generate main animation data. Each track is encoded and written (to both
+            # animation_data.json and flight_tracks.jsonl) as soon as it is built, so
+            # only one track is held in memory; metadata goes last once the count is known.
+            # The file is compact unless DEBUG logging is on, which pretty-prints it for inspection.
+            pretty = logger.isEnabledFor(logging.DEBUG)
             
-
+            def encode(obj: Any) -> str:
+                return json.dumps(obj, indent=2) if pretty else json.dumps(obj, separators=COMPACT_SEPARATORS)
+            
+            total_flights = 0
+            bbox = None  # [min_lat, max_lat, min_lon, max_lon] over all track points
+            start_minutes = self.event_start_minutes()
+            track_index = {}
+            with open('animation/animation_data.json', 'w') as f, \
+                    open('animation/flight_tracks.jsonl', 'w') as tracks_jsonl, \
+                    open('animation/flight_tracks.bin', 'wb') as tracks_bin:
+                f.write('{"flights":[')
+                for track in self.iter_flight_tracks():
+                    compact = json.dumps(track, separators=COMPACT_SEPARATORS)
+                    f.write(',\n' if total_flights else '\n')
+                    f.write(encode(track) if pretty else compact)
+                    tracks_jsonl.write(compact + '\n')
+                    track_index[track['flight_id']] = {
+                        'offset': tracks_bin.tell(),
+                        'count': len(track['waypoints']['lat'])
+                    }
+                    pack_track_points(track['waypoints'], start_minutes).tofile(tracks_bin)
+                    total_flights += 1
+                    lats = track['waypoints']['lat']
+                    lons = track['waypoints']['lon']
+                    if lats:
+                        if bbox is None:
+                            bbox = [min(lats), max(lats), min(lons), max(lons)]
+                        else:
+                            bbox = [min(bbox[0], min(lats)), max(bbox[1], max(lats)),
+                                    min(bbox[2], min(lons)), max(bbox[3], max(lons))]
+                
+                # Update metadata
+                self.animation_data['metadata'].update({
+                    'total_flights': total_flights,
+                    'total_conflicts': len(filtered_conflicts),
+                    'event_duration': len(timeline),
+                    'event_start': self.event_start_time,
+                    'event_end': self.event_end_time,
+                    'bbox': dict(zip(('min_lat', 'max_lat', 'min_lon', 'max_lon'), bbox)) if bbox else None
+                })
+                
+                f.write('\n],\n"conflicts":')
+                f.write(encode(filtered_conflicts))
+                f.write(',\n"timeline":')
+                f.write(encode(timeline))
+                f.write(',\n"metadata":')
+                f.write(encode(self.animation_data['metadata']))
+                f.write('\n}\n')
+            
+            write_json('animation/flight_tracks_index.json', {
+                'dtype': 'float32',
+                'byte_order': 'little',
+                'fields': list(TRACK_BIN_FIELDS),
+                'tracks': track_index
+            })
             
             # Generate conflict points file
-            with open('animation/conflict_points.json', 'w') as f:
-                json.dump(filtered_conflicts, f, indent=2)
+            write_json('animation/conflict_points.json', filtered_conflicts)
+            
+            # Line-delimited copy for streaming consumers
+            write_jsonl('animation/conflict_points.jsonl', filtered_conflicts)
             
             logger.info("Animation data generated successfully!")
             logger.info(f"Generated files:")
             logger.info(f"   animation_data.json - Complete animation data")
             logger.info(f"   conflict_points.json - Conflict locations")
+            logger.info(f"   flight_tracks.jsonl, conflict_points.jsonl - One record per line")
+            logger.info(f"   flight_tracks.bin, flight_tracks_index.json - Packed float32 track points")
             
             return True
             
@@ -510,6 +625,8 @@ class AnimationDataGenerator:
         print(f"Generated files:")
         print(f"   - animation/animation_data.json - Flight tracks and metadata")
         print(f"   - animation/conflict_points.json - Conflict points for visualization")
+        print(f"   - animation/flight_tracks.jsonl, animation/conflict_points.jsonl - Line-delimited copies")
+        print(f"   - animation/flight_tracks.bin, animation/flight_tracks_index.json - Binary track points")
         return True
 
 
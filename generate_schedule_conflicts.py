@@ -46,6 +46,7 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Set, Any
 import logging
 from collections import defaultdict
+from operator import itemgetter
 from env import (
     MIN_DEPARTURE_SEPARATION_MINUTES, MIN_SAME_ROUTE_SEPARATION_MINUTES, BATCH_SIZE,
     TIME_TOLERANCE_MINUTES, MAX_DEPARTURE_TIME_MINUTES, DEPARTURE_TIME_STEP_MINUTES,
@@ -106,29 +107,29 @@ def optimize_departure_times(flight_plans: List[FlightPlan], potential_conflicts
         best_score = 0
         origin = flight_origin[flight_idx]
         
+        # Departure times already taken at this origin, and the departure each
+        # conflict with an already-scheduled flight would suggest; neither changes
+        # while the candidate times for this flight are scored
+        same_origin_times = [t for idx, t in departure_times.items()
+                             if idx != flight_idx and flight_origin[idx] == origin]
+        suggested_departures = []
+        for conflict in potential_conflicts:
+            if conflict['flight1_idx'] == flight_idx or conflict['flight2_idx'] == flight_idx:
+                other_flight = conflict['flight2_idx'] if conflict['flight1_idx'] == flight_idx else conflict['flight1_idx']
+                if other_flight in departure_times:
+                    other_time = departure_times[other_flight]
+                    flight_time = conflict['time1'] if conflict['flight1_idx'] == flight_idx else conflict['time2']
+                    other_conflict_time = conflict['time2'] if conflict['flight1_idx'] == flight_idx else conflict['time1']
+                    conflict_time = other_time + other_conflict_time
+                    suggested_departures.append(conflict_time - flight_time)
+        
         for test_time in range(0, MAX_DEPARTURE_TIME_MINUTES, DEPARTURE_TIME_STEP_MINUTES):
             # Enforce 2-min separation from same-origin flights
-            if any(abs(test_time - t) < MIN_DEPARTURE_SEPARATION_MINUTES and flight_origin[idx] == origin for idx, t in departure_times.items() if idx != flight_idx):
+            if any(abs(test_time - t) < MIN_DEPARTURE_SEPARATION_MINUTES for t in same_origin_times):
                 continue
             
-            score = 0
-            for conflict in potential_conflicts:
-                if conflict['flight1_idx'] == flight_idx or conflict['flight2_idx'] == flight_idx:
-                    other_flight = conflict['flight2_idx'] if conflict['flight1_idx'] == flight_idx else conflict['flight1_idx']
-                    if other_flight in departure_times:
-                        other_time = departure_times[other_flight]
-                        flight_time = conflict['time1'] if conflict['flight1_idx'] == flight_idx else conflict['time2']
-                        other_conflict_time = conflict['time2'] if conflict['flight1_idx'] == flight_idx else conflict['time1']
-                        
-                        if conflict['flight1_idx'] == flight_idx:
-                            conflict_time = other_time + other_conflict_time
-                            suggested_departure = conflict_time - flight_time
-                        else:
-                            conflict_time = other_time + other_conflict_time
-                            suggested_departure = conflict_time - flight_time
-                        
-                        if abs(test_time - suggested_departure) < TIME_TOLERANCE_MINUTES:
-                            score += 1
+            score = sum(1 for suggested_departure in suggested_departures
+                        if abs(test_time - suggested_departure) < TIME_TOLERANCE_MINUTES)
             
             if score > best_score:
                 best_score = score
@@ -209,6 +210,13 @@ def minutes_to_utc_hhmm(minutes: float) -> str:
     mins = total_minutes % 60
     return f"{hours:02d}{mins:02d}"
 
+# HHMM string for every minute of the day, indexed by whole minutes since midnight
+HHMM_BY_MINUTE_OF_DAY = tuple(f"{hours:02d}{mins:02d}" for hours in range(24) for mins in range(60))
+
+def minute_of_day_to_utc_hhmm(utc_minutes: float) -> str:
+    """Convert minutes since midnight (0 <= utc_minutes < 1440) to HHMM, truncating seconds"""
+    return HHMM_BY_MINUTE_OF_DAY[int(utc_minutes)]
+
 def extract_flight_route_info(flight_data: Dict) -> Dict[str, Dict[str, str]]:
     """Extract origin-destination information for each flight from flight data."""
     route_info = {}
@@ -297,24 +305,33 @@ class ConflictScheduler:
         # logging.info(f"Aircraft with longest time to first conflict: {longest_time_aircraft[0]} ({longest_time_aircraft[1]} minutes)")
         return longest_time_aircraft[0]
     
+    def index_conflicts_by_flight(self, conflicts: List[Dict]) -> Dict[str, List[Dict]]:
+        """Map each flight ID to its conflicts, keeping the original conflict order."""
+        by_flight = {}
+        for conflict in conflicts:
+            by_flight.setdefault(conflict['flight1'], []).append(conflict)
+            if conflict['flight2'] != conflict['flight1']:
+                by_flight.setdefault(conflict['flight2'], []).append(conflict)
+        return by_flight
+    
     def calculate_conflict_score(self, aircraft: str, scheduled_aircraft: Set[str], 
                                conflicts: List[Dict], all_aircraft: List[str]) -> int:
         """Calculate conflict score for greedy selection."""
         immediate_conflicts = 0
         future_potential = 0
         
-        # Count immediate conflicts with already-scheduled aircraft
+        # One pass: conflicts with already-scheduled aircraft count as immediate,
+        # conflicts with unscheduled aircraft as potential (bonus points)
         for conflict in conflicts:
-            if conflict['flight1'] == aircraft and conflict['flight2'] in scheduled_aircraft:
-                immediate_conflicts += 1
-            elif conflict['flight2'] == aircraft and conflict['flight1'] in scheduled_aircraft:
+            if conflict['flight1'] == aircraft:
+                other = conflict['flight2']
+            elif conflict['flight2'] == aircraft:
+                other = conflict['flight1']
+            else:
+                continue
+            if other in scheduled_aircraft:
                 immediate_conflicts += 1
-        
-        # Count potential conflicts with unscheduled aircraft (bonus points)
-        for conflict in conflicts:
-            if conflict['flight1'] == aircraft and conflict['flight2'] not in scheduled_aircraft:
-                future_potential += 1
-            elif conflict['flight2'] == aircraft and conflict['flight1'] not in scheduled_aircraft:
+            else:
                 future_potential += 1
         
         # Weighted score: immediate conflicts count more than future potential
@@ -510,6 +527,8 @@ class ConflictScheduler:
             return {}
         # Step 1: Find aircraft with longest time to first conflict
         first_aircraft = self.find_aircraft_with_longest_time_to_first_conflict(conflicts)
+        # Per-flight index so each lookup below only touches that flight's conflicts
+        conflicts_by_flight = self.index_conflicts_by_flight(conflicts)
         if not first_aircraft:
             first_aircraft = all_aircraft[0]  # Fallback
         scheduled_aircraft = {}
@@ -529,13 +548,17 @@ class ConflictScheduler:
             # Calculate conflict scores for all unscheduled aircraft
             best_aircraft = None
             best_score = -1
+            scheduled_set = set(scheduled_aircraft)  # Fixed for this selection round
             for aircraft in unscheduled_aircraft:
-                score = self.calculate_conflict_score(aircraft, set(scheduled_aircraft.keys()), conflicts, all_aircraft)
+                score = self.calculate_conflict_score(
+                    aircraft, scheduled_set, conflicts_by_flight.get(aircraft, []), all_aircraft)
                 # If immediate conflicts are equal, consider future potential
                 if score == best_score and best_aircraft:
                     # Check future potential for tie-breaking
-                    future_potential_best = self._count_future_potential(best_aircraft, unscheduled_aircraft, conflicts)
-                    future_potential_current = self._count_future_potential(aircraft, unscheduled_aircraft, conflicts)
+                    future_potential_best = self._count_future_potential(
+                        best_aircraft, unscheduled_aircraft, conflicts_by_flight.get(best_aircraft, []))
+                    future_potential_current = self._count_future_potential(
+                        aircraft, unscheduled_aircraft, conflicts_by_flight.get(aircraft, []))
                     if future_potential_current > future_potential_best:
                         best_aircraft = aircraft
                         best_score = score
@@ -547,7 +570,8 @@ class ConflictScheduler:
                 best_aircraft = list(unscheduled_aircraft)[0]
             # Find optimal departure time for selected aircraft
             departure_time, conflict_count = self.find_optimal_departure_time(
-                best_aircraft, scheduled_aircraft, conflicts, all_aircraft, route_info
+                best_aircraft, scheduled_aircraft, conflicts_by_flight.get(best_aircraft, []),
+                all_aircraft, route_info
             )
             if departure_time is None:
                 # No valid departure time found - skip this aircraft
@@ -564,18 +588,17 @@ class ConflictScheduler:
         for aircraft, departure_time in scheduled_aircraft.items():
             # Count conflicts for this aircraft
             aircraft_conflicts = []
-            for conflict in conflicts:
-                if conflict['flight1'] == aircraft or conflict['flight2'] == aircraft:
-                    other_aircraft = conflict['flight2'] if conflict['flight1'] == aircraft else conflict['flight1']
-                    aircraft_conflicts.append({
-                        'conflict_id': f"{aircraft}_{other_aircraft}",
-                        'other_flight': other_aircraft,
-                        'conflict_time': conflict['time1'] if conflict['flight1'] == aircraft else conflict['time2'],
-                        'location': conflict.get('waypoint1', 'Unknown'),
-                        'distance': conflict.get('distance', 0),
-                        'altitude_diff': conflict.get('altitude_diff', 0),
-                        'phase': conflict.get('stage1', 'Unknown')
-                    })
+            for conflict in conflicts_by_flight.get(aircraft, []):
+                other_aircraft = conflict['flight2'] if conflict['flight1'] == aircraft else conflict['flight1']
+                aircraft_conflicts.append({
+                    'conflict_id': f"{aircraft}_{other_aircraft}",
+                    'other_flight': other_aircraft,
+                    'conflict_time': conflict['time1'] if conflict['flight1'] == aircraft else conflict['time2'],
+                    'location': conflict.get('waypoint1', 'Unknown'),
+                    'distance': conflict.get('distance', 0),
+                    'altitude_diff': conflict.get('altitude_diff', 0),
+                    'phase': conflict.get('stage1', 'Unknown')
+                })
             scheduled_flights[aircraft] = {
                 'departure_time': departure_time,
                 'conflicts': aircraft_conflicts,
@@ -714,16 +737,11 @@ class ConflictScheduler:
         output.append("Time  | FLT 1 v FLT 2 | Phase      | Altitude")
         output.append("-" * 50)
         
-        # Load original conflict data to get proper stage and altitude info
+        # Index original conflict data (already loaded by the caller) for proper stage and altitude info
         original_conflicts = {}
-        try:
-            with open('temp/potential_conflict_data.json', 'r') as f:
-                conflict_data = json.load(f)
-                for conflict in conflict_data.get('potential_conflicts', []):
-                    key = f"{conflict['flight1']}_{conflict['flight2']}"
-                    original_conflicts[key] = conflict
-        except:
-            pass
+        for conflict in original_data.get('potential_conflicts', []):
+            key = f"{conflict['flight1']}_{conflict['flight2']}"
+            original_conflicts[key] = conflict
         
         # Collect all conflicts (avoid duplicates: only log each pair once, with the earlier flight as FLT 1)
         conflict_rows = []
@@ -738,8 +756,11 @@ class ConflictScheduler:
                         rounded_minutes = round(conflict_time_minutes)
                         conflict_time = departure_time + timedelta(minutes=rounded_minutes)
                         time_str = datetime_to_utc_hhmm(conflict_time)
+                        # Minutes since event start: integer sort key that stays ordered across midnight
+                        sort_minutes = int((conflict_time - self.start_time).total_seconds() // 60)
                     else:
                         time_str = ""
+                        sort_minutes = -1
                     
                     # Flight pair
                     flight_pair = f"{flight} v {other_flight}"
@@ -774,13 +795,13 @@ class ConflictScheduler:
                     else:
                         alt_display = ""
                     
-                    conflict_rows.append((time_str, flight_pair, phase_display, alt_display))
+                    conflict_rows.append((sort_minutes, time_str, flight_pair, phase_display, alt_display))
         
         # Sort conflicts by time
-        conflict_rows.sort(key=lambda x: x[0] if x[0] else "")
+        conflict_rows.sort(key=itemgetter(0))
         
         # Add conflict rows to output
-        for time_str, flight_pair, phase_display, alt_display in conflict_rows:
+        for _, time_str, flight_pair, phase_display, alt_display in conflict_rows:
             output.append(f"{time_str:<6} | {flight_pair:<13} | {phase_display:<11} | {alt_display}")
         
         if not conflict_rows:
@@ -884,8 +905,11 @@ class ConflictScheduler:
         
         return "\n".join(output)
     
-    def update_interpolated_points_with_schedule(self, scheduled_flights: Dict) -> None:
-        """Update interpolated points file with departure schedule metadata, aircraft type, and conflict data."""
+    def update_interpolated_points_with_schedule(self, scheduled_flights: Dict, conflict_data: Optional[Dict] = None) -> None:
+        """Update interpolated points file with departure schedule metadata, aircraft type, and conflict data.
+        
+        conflict_data is the already-loaded potential_conflict_data.json; it is read from disk if not given.
+        """
         try:
             interp_path = 'temp/routes_with_added_interpolated_points.json'
             if not os.path.exists(interp_path):
@@ -895,8 +919,9 @@ class ConflictScheduler:
                 routes = json.load(f)
 
             # Load aircraft types and conflict data from potential_conflict_data.json
-            with open('temp/potential_conflict_data.json', 'r') as f:
-                conflict_data = json.load(f)
+            if conflict_data is None:
+                with open(CONFLICT_ANALYSIS_FILE, 'r') as f:
+                    conflict_data = json.load(f)
             
             # Build a mapping from flight_id to aircraft_type (handle nested structure)
             acft_type_map = {}
@@ -923,10 +948,7 @@ class ConflictScheduler:
                         if isinstance(pt, dict):
                             orig_time = pt.get('time', 0)
                             utc_minutes = dep_min + (orig_time if isinstance(orig_time, (int, float)) else 0)
-                            utc_minutes = utc_minutes % (24 * 60)
-                            hours = int(utc_minutes // 60)
-                            mins = int(utc_minutes % 60)
-                            pt['time'] = f"{hours:02d}{mins:02d}"
+                            pt['time'] = minute_of_day_to_utc_hhmm(utc_minutes % (24 * 60))
                 
                 # Compose new structure with aircraft type
                 new_routes[flight_id] = {
@@ -935,6 +957,11 @@ class ConflictScheduler:
                     'conflicts': []  # Will be populated below
                 }
 
+            # Index original conflicts by unordered flight pair (first match wins)
+            original_by_pair = {}
+            for orig_conflict in conflict_data.get('potential_conflicts', []):
+                original_by_pair.setdefault(frozenset((orig_conflict['flight1'], orig_conflict['flight2'])), orig_conflict)
+
             # Add conflict data to each flight
             for flight_id, flight_data in scheduled_flights.items():
                 if flight_id in new_routes:
@@ -947,18 +974,10 @@ class ConflictScheduler:
                         other_flight = conflict['other_flight']
                         conflict_time = conflict['conflict_time']
                         utc_minutes = dep_min + conflict_time
-                        utc_minutes = utc_minutes % (24 * 60)
-                        hours = int(utc_minutes // 60)
-                        mins = int(utc_minutes % 60)
-                        conflict_time_utc = f"{hours:02d}{mins:02d}"
+                        conflict_time_utc = minute_of_day_to_utc_hhmm(utc_minutes % (24 * 60))
                         
                         # Find the original conflict data to get lat/lon/alt
-                        original_conflict = None
-                        for orig_conflict in conflict_data.get('potential_conflicts', []):
-                            if ((orig_conflict['flight1'] == flight_id and orig_conflict['flight2'] == other_flight) or
-                                (orig_conflict['flight1'] == other_flight and orig_conflict['flight2'] == flight_id)):
-                                original_conflict = orig_conflict
-                                break
+                        original_conflict = original_by_pair.get(frozenset((flight_id, other_flight)))
                         
                         # Create conflict entry with data from original conflict
                         conflict_entry = {
@@ -982,10 +1001,7 @@ class ConflictScheduler:
                         other_flight = conflict['other_flight']
                         conflict_time = conflict['conflict_time']
                         utc_minutes = dep_min + conflict_time
-                        utc_minutes = utc_minutes % (24 * 60)
-                        hours = int(utc_minutes // 60)
-                        mins = int(utc_minutes % 60)
-                        conflict_hhmm = f"{hours:02d}{mins:02d}"
+                        conflict_hhmm = minute_of_day_to_utc_hhmm(utc_minutes % (24 * 60))
                         for pt in new_routes[flight_id]['route']:
                             if isinstance(pt, dict) and (pt.get('name', '').startswith('CONFLICT_') and other_flight in pt.get('name', '')):
                                 pt['time'] = conflict_hhmm
@@ -1010,8 +1026,10 @@ class ConflictScheduler:
                     'conflicts': len(flight_data.get('conflicts', []))
                 }
             
+            # Encode first and write once; json.dump issues one write per token
+            payload = json.dumps(new_routes, indent=2)
             with open(interp_path, 'w') as f:
-                json.dump(new_routes, f, indent=2)
+                f.write(payload)
         except Exception as e:
             import traceback
             traceback.print_exc()
@@ -1037,7 +1055,7 @@ class ConflictScheduler:
         
         # Update interpolated points with schedule
         # logging.info("Updating interpolated points with schedule...")
-        self.update_interpolated_points_with_schedule(scheduled_flights)
+        self.update_interpolated_points_with_schedule(scheduled_flights, data)
 
         # Generate outputs
         # logging.info("Generating schedule outputs...")
@@ -18,13 +18,14 @@ from dataclasses import dataclass
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Waypoint:
     """
     Represents a navigation waypoint with coordinates and flight data.
     
     This is the unified waypoint class used throughout the system.
     Provides both standard time formatting and SimBrief-specific formatting.
+    Slotted, since a run holds one instance per navlog fix of every flight.
     """
     name: str
     lat: float
@@ -90,21 +91,33 @@ class FlightPlan:
         self.waypoints: List[Waypoint] = []
         self.departure: Optional[Waypoint] = None
         self.arrival: Optional[Waypoint] = None
+        # Built by get_all_waypoints; reset whenever the waypoints change
+        self._all_waypoints: Optional[List[Waypoint]] = None
     
     def add_waypoint(self, waypoint: Waypoint) -> None:
         """Add a waypoint to the flight plan."""
         self.waypoints.append(waypoint)
+        self._all_waypoints = None
     
     def set_departure(self, waypoint: Waypoint) -> None:
         """Set the departure waypoint."""
         self.departure = waypoint
+        self._all_waypoints = None
     
     def set_arrival(self, waypoint: Waypoint) -> None:
         """Set the arrival waypoint."""
         self.arrival = waypoint
+        self._all_waypoints = None
     
     def get_all_waypoints(self) -> List[Waypoint]:
-        """Get all waypoints including departure and arrival."""
+        """
+        Get all waypoints including departure and arrival.
+        
+        The list is cached until the next add_waypoint/set_departure/set_arrival
+        call, so callers must treat it as read-only.
+        """
+        if self._all_waypoints is not None:
+            return self._all_waypoints
         all_waypoints = []
         if self.departure:
             all_waypoints.append(self.departure)
@@ -117,6 +130,7 @@ class FlightPlan:
                 pass
             else:
                 all_waypoints.append(self.arrival)
+        self._all_waypoints = all_waypoints
         return all_waypoints
     
     def get_route_identifier(self) -> str:
@@ -130,14 +144,16 @@ class FlightPlan:
     
     def to_dict(self) -> dict:
         """Convert flight plan to dictionary for JSON serialization."""
+        # all_waypoints reuses the dicts built for departure, waypoints and arrival
+        waypoint_dicts = {id(wp): wp.to_dict() for wp in self.get_all_waypoints()}
         return {
             'origin': self.origin,
             'destination': self.destination,
             'route': self.route,
             'flight_id': self.flight_id,
             'aircraft_type': self.aircraft_type,
-            'departure': self.departure.to_dict() if self.departure else None,
-            'waypoints': [wp.to_dict() for wp in self.waypoints],
+            'departure': waypoint_dicts[id(self.departure)] if self.departure else None,
+            'waypoints': [waypoint_dicts[id(wp)] for wp in self.waypoints],
             'arrival': self.arrival.to_dict() if self.arrival else None,
-            'all_waypoints': [wp.to_dict() for wp in self.get_all_waypoints()]
+            'all_waypoints': [waypoint_dicts[id(wp)] for wp in self.get_all_waypoints()]
         } 
\ No newline at end of file